@@ -46,10 +46,15 @@ app.get("/", async (req, res) => {
   res.send("Welcome to the Mongoose API");
 });
 
-// Express route to fetch all reviews
+// Express route to fetch all reviews, or only those with an id above
+// ?since_id= for incremental syncs
 app.get("/fetchReviews", async (req, res) => {
   try {
-    const documents = await Reviews.find();
+    const filter = {};
+    if (req.query.since_id !== undefined) {
+      filter.id = { $gt: Number(req.query.since_id) };
+    }
+    const documents = await Reviews.find(filter).sort({ id: 1 });
     res.json(documents);
   } catch (error) {
     res.status(500).json({ error: "Error fetching documents" });
@@ -1,14 +1,15 @@
 """
-This module registers the CarMake and CarModel models with the Django admin site.
+This module registers the djangoapp models with the Django admin site.
 """
 
 from django.contrib import admin  # noqa: I001
-from .models import CarMake, CarModel
+from .models import CarMake, CarModel, DealerSentiment
 
 # Register your models here.
 # Registering models with their respective admins
 admin.site.register(CarMake)
 admin.site.register(CarModel)
+admin.site.register(DealerSentiment)
 
 # CarModelInline class
 
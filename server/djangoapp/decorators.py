@@ -0,0 +1,96 @@
+"""
+View decorators for the djangoapp application.
+
+This module provides ``conditional_json``, which adds strong ETags and
+``Cache-Control`` headers to JSON views and answers ``If-None-Match`` with
+``304 Not Modified``, so browsers and any CDN in front of gunicorn can
+absorb repeat traffic.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+
+def _strip_weak(etag):
+    """
+    Returns ``etag`` without its ``W/`` prefix, for weak comparison.
+    """
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def get_cache_policy(name):
+    """
+    Returns the ``Cache-Control`` directives configured for a view.
+
+    Policies live in the ``API_CACHE_CONTROL`` setting, keyed by view name,
+    as keyword arguments for ``patch_cache_control`` (e.g. ``max_age``,
+    ``stale_while_revalidate``).
+
+    Args:
+        name (str): The key of the view in ``API_CACHE_CONTROL``.
+
+    Returns:
+        dict: The directives, or an empty dict if none are configured.
+    """
+    return getattr(settings, "API_CACHE_CONTROL", {}).get(name, {})
+
+
+def conditional_json(name):
+    """
+    Adds a strong ETag and a per-view ``Cache-Control`` header to a view.
+
+    The ETag is a SHA-256 hash of the response body. When the request's
+    ``If-None-Match`` matches it, the body is dropped and ``304`` is returned
+    instead. ``If-None-Match`` uses weak comparison, so ETags weakened by the
+    compression middleware still match.
+
+    Responses that are not ``200``, are streamed, or already set their own
+    ``Cache-Control`` (e.g. ``no-store`` on an upstream failure) are
+    returned unchanged.
+
+    Args:
+        name (str): The key of the view's policy in ``API_CACHE_CONTROL``.
+
+    Returns:
+        callable: The view decorator.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+            if (
+                request.method not in ("GET", "HEAD")
+                or response.status_code != 200
+                or response.streaming
+                or response.has_header("Cache-Control")
+            ):
+                return response
+
+            etag = quote_etag(hashlib.sha256(response.content).hexdigest())
+            policy = get_cache_policy(name)
+
+            if_none_match = request.headers.get("If-None-Match")
+            if if_none_match:
+                for client_etag in parse_etags(if_none_match):
+                    if client_etag == "*" or _strip_weak(client_etag) == etag:
+                        response = HttpResponseNotModified()
+                        # Echo the validator in the form the client holds
+                        # (possibly weakened by compression).
+                        if client_etag != "*":
+                            etag = client_etag
+                        break
+
+            response["ETag"] = etag
+            if policy:
+                patch_cache_control(response, **policy)
+            return response
+
+        return wrapper
+
+    return decorator
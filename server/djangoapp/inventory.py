@@ -0,0 +1,252 @@
+"""
+Columnar in-memory index over dealer car inventory.
+
+The inventory in ``database/data/car_records.json`` is loaded once per
+worker into NumPy column arrays sorted by dealer, so each dealer's cars sit
+in one contiguous slice found by a dictionary lookup. Filters and sorting
+are then vectorized over that slice, which keeps queries well under a
+millisecond even with millions of rows and no round trip to the backend.
+
+String columns (make, model, body type) are dictionary-encoded into small
+integer codes; matching on them is case-insensitive.
+"""
+
+import json
+import logging
+import threading
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SORT_FIELDS = ("year", "mileage", "price", "make", "model")
+
+
+class _Dictionary:
+    """
+    Maps string values to dense integer codes and back.
+    """
+
+    def __init__(self):
+        self.codes = {}  # lowercased value -> code
+        self.values = []  # code -> value as first seen
+
+    def encode(self, value):
+        key = str(value).strip().lower()
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.values)
+            self.values.append(str(value))
+        return code
+
+    def lookup(self, value):
+        """
+        Returns the code for ``value``, or -1 if it never occurs.
+        """
+        return self.codes.get(str(value).strip().lower(), -1)
+
+
+class InventoryIndex:
+    """
+    A read-only columnar index over car inventory records.
+
+    Records need ``dealer_id``, ``make``, ``model``, ``bodyType``, ``year``
+    and ``mileage``; ``price`` is optional and stored as NaN when missing,
+    so rows without a price never match a price filter.
+    """
+
+    def __init__(self, records):
+        self._makes = _Dictionary()
+        self._models = _Dictionary()
+        self._bodies = _Dictionary()
+
+        count = len(records)
+        dealer_id = np.empty(count, dtype=np.int32)
+        make = np.empty(count, dtype=np.int32)
+        model = np.empty(count, dtype=np.int32)
+        body = np.empty(count, dtype=np.int32)
+        year = np.empty(count, dtype=np.int16)
+        mileage = np.empty(count, dtype=np.int32)
+        price = np.empty(count, dtype=np.float64)
+        for row, record in enumerate(records):
+            dealer_id[row] = record["dealer_id"]
+            make[row] = self._makes.encode(record["make"])
+            model[row] = self._models.encode(record["model"])
+            body[row] = self._bodies.encode(record["bodyType"])
+            year[row] = record["year"]
+            mileage[row] = record["mileage"]
+            value = record.get("price")
+            price[row] = np.nan if value is None else value
+
+        # Sort rows by dealer so each dealer is one contiguous slice
+        order = np.argsort(dealer_id, kind="stable")
+        self.dealer_id = dealer_id[order]
+        self.make = make[order]
+        self.model = model[order]
+        self.body = body[order]
+        self.year = year[order]
+        self.mileage = mileage[order]
+        self.price = price[order]
+
+        # Per-dealer row ranges into the sorted columns
+        dealers, starts, counts = np.unique(
+            self.dealer_id, return_index=True, return_counts=True
+        )
+        self._dealer_slices = {
+            int(dealer): slice(int(start), int(start + count))
+            for dealer, start, count in zip(
+                dealers, starts, counts, strict=True
+            )
+        }
+
+        self._make_names = np.array(self._makes.values, dtype=object)
+        self._model_names = np.array(self._models.values, dtype=object)
+        self._body_names = np.array(self._bodies.values, dtype=object)
+
+    def __len__(self):
+        return len(self.dealer_id)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Loads an index from a JSON file shaped like ``car_records.json``.
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(data["cars"])
+
+    def _dealer_slice(self, dealer_id):
+        return self._dealer_slices.get(int(dealer_id), slice(0, 0))
+
+    def query(
+        self,
+        dealer_id,
+        make=None,
+        model=None,
+        body_type=None,
+        year_min=None,
+        year_max=None,
+        max_mileage=None,
+        price_min=None,
+        price_max=None,
+        sort=None,
+        offset=0,
+        limit=50,
+    ):
+        """
+        Returns a dealer's cars that match every given filter.
+
+        Args:
+            dealer_id (int): The dealer whose inventory to search.
+            make (str, optional): Exact make, case-insensitive.
+            model (str, optional): Exact model, case-insensitive.
+            body_type (str, optional): Exact body type, case-insensitive.
+            year_min (int, optional): Earliest model year, inclusive.
+            year_max (int, optional): Latest model year, inclusive.
+            max_mileage (int, optional): Highest mileage, inclusive.
+            price_min (float, optional): Lowest price, inclusive.
+            price_max (float, optional): Highest price, inclusive.
+            sort (str, optional): A name from ``SORT_FIELDS``, prefixed with
+                                  "-" for descending order.
+            offset (int, optional): Matches to skip. Defaults to 0.
+            limit (int, optional): Maximum cars to return. Defaults to 50.
+
+        Returns:
+            tuple: ``(total, cars)`` where ``total`` is the number of matches
+                   and ``cars`` the requested window as a list of dicts.
+
+        Raises:
+            ValueError: If ``sort`` is not a supported field.
+        """
+        window = self._dealer_slice(dealer_id)
+        mask = np.ones(window.stop - window.start, dtype=bool)
+
+        for column, names, value in (
+            (self.make, self._makes, make),
+            (self.model, self._models, model),
+            (self.body, self._bodies, body_type),
+        ):
+            if value is not None:
+                mask &= column[window] == names.lookup(value)
+        if year_min is not None:
+            mask &= self.year[window] >= year_min
+        if year_max is not None:
+            mask &= self.year[window] <= year_max
+        if max_mileage is not None:
+            mask &= self.mileage[window] <= max_mileage
+        if price_min is not None:
+            mask &= self.price[window] >= price_min
+        if price_max is not None:
+            mask &= self.price[window] <= price_max
+
+        rows = np.flatnonzero(mask) + window.start
+        if sort:
+            rows = rows[self._sort_order(rows, sort)]
+        rows = rows[offset : offset + limit]
+        return int(mask.sum()), self._records(rows)
+
+    def _sort_order(self, rows, sort):
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {field!r}")
+        if field == "make":
+            keys = self._make_names[self.make[rows]].astype(str)
+        elif field == "model":
+            keys = self._model_names[self.model[rows]].astype(str)
+        else:
+            keys = getattr(self, field)[rows].astype(np.float64)
+            if descending:
+                # Negate rather than reverse so ties and NaN prices keep
+                # their place at the end.
+                return np.argsort(-keys, kind="stable")
+        order = np.argsort(keys, kind="stable")
+        return order[::-1] if descending else order
+
+    def _records(self, rows):
+        makes = self._make_names[self.make[rows]]
+        models = self._model_names[self.model[rows]]
+        bodies = self._body_names[self.body[rows]]
+        cars = []
+        for i, row in enumerate(rows):
+            price = self.price[row]
+            cars.append(
+                {
+                    "dealer_id": int(self.dealer_id[row]),
+                    "make": makes[i],
+                    "model": models[i],
+                    "bodyType": bodies[i],
+                    "year": int(self.year[row]),
+                    "mileage": int(self.mileage[row]),
+                    "price": None if np.isnan(price) else float(price),
+                }
+            )
+        return cars
+
+
+_inventory_index = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory_index():
+    """
+    Returns the process-wide inventory index, loading it on first use.
+
+    The data file is taken from the ``INVENTORY_DATA_PATH`` setting.
+
+    Returns:
+        InventoryIndex: The loaded index.
+    """
+    global _inventory_index
+    if _inventory_index is None:
+        with _inventory_lock:
+            if _inventory_index is None:
+                path = settings.INVENTORY_DATA_PATH
+                _inventory_index = InventoryIndex.from_file(path)
+                logger.info(
+                    "Loaded %d inventory rows from %s",
+                    len(_inventory_index),
+                    path,
+                )
+    return _inventory_index
@@ -0,0 +1,105 @@
+"""
+Benchmark for the API response compression middleware.
+
+Builds the JSON bodies of the main API endpoints from the seed data shipped
+in ``database/data`` and reports, per endpoint and coding, the compressed
+size, compression ratio and CPU time per response.
+
+Usage:
+    python manage.py bench_compression [--number N]
+"""
+
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...middleware import brotli, compress_brotli, compress_gzip
+from ...responses import dumps
+
+DATA_DIR = settings.BASE_DIR / "database" / "data"
+
+
+class Command(BaseCommand):
+    """
+    Reports compression ratio and CPU cost per endpoint.
+    """
+
+    help = "Benchmark gzip/Brotli compression of the API JSON responses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=100,
+            help="Number of compressions per measurement.",
+        )
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        codecs = [
+            ("gzip", compress_gzip, settings.COMPRESSION_GZIP_LEVEL),
+            ("gzip-1", compress_gzip, 1),
+            ("gzip-9", compress_gzip, 9),
+        ]
+        if brotli is not None:
+            codecs += [
+                ("br", compress_brotli, settings.COMPRESSION_BROTLI_LEVEL),
+                ("br-11", compress_brotli, 11),
+            ]
+        else:
+            self.stderr.write("brotli is not installed; skipping Brotli.")
+
+        self.stdout.write(
+            f"{'endpoint':<28}{'coding':<8}{'raw':>8}{'out':>8}"
+            f"{'ratio':>8}{'cpu us':>10}"
+        )
+        for endpoint, body in self._bodies():
+            for name, compress, level in codecs:
+                size = len(compress(body, level))
+                start = time.process_time()
+                for _ in range(number):
+                    compress(body, level)
+                cpu = (time.process_time() - start) / number
+                self.stdout.write(
+                    f"{endpoint:<28}{name:<8}{len(body):>8}{size:>8}"
+                    f"{len(body) / size:>8.2f}{cpu * 1e6:>10.1f}"
+                )
+
+    def _bodies(self):
+        """
+        Yields ``(endpoint, body)`` pairs shaped like the view responses.
+        """
+        dealers = json.loads((DATA_DIR / "dealerships.json").read_bytes())
+        dealers = dealers["dealerships"]
+        reviews = json.loads((DATA_DIR / "reviews.json").read_bytes())
+        reviews = reviews["reviews"]
+        cars = json.loads((DATA_DIR / "car_records.json").read_bytes())
+        cars = cars["cars"]
+
+        yield "get_dealers/", dumps({"status": 200, "dealers": dealers})
+        texas = [d for d in dealers if d["state"] == "Texas"]
+        yield "get_dealers/Texas", dumps({"status": 200, "dealers": texas})
+
+        models = sorted({(car["model"], car["make"]) for car in cars})
+        car_models = [{"CarModel": m, "CarMake": mk} for m, mk in models]
+        yield "get_cars/", dumps({"CarModels": car_models})
+
+        # The busiest dealer's review list, with sentiment attached
+        counts = {}
+        for review in reviews:
+            counts[review["dealership"]] = (
+                counts.get(review["dealership"], 0) + 1
+            )
+        busiest = max(counts, key=counts.get)
+        dealer_reviews = [
+            dict(review, sentiment="positive")
+            for review in reviews
+            if review["dealership"] == busiest
+        ]
+        yield (
+            f"reviews/dealer/{busiest}",
+            dumps({"status": 200, "reviews": dealer_reviews}),
+        )
+        yield "reviews (all)", dumps({"status": 200, "reviews": reviews})
@@ -0,0 +1,85 @@
+"""
+Benchmark for the columnar inventory index.
+
+Scales the seed ``car_records.json`` up to the requested number of rows,
+spreading copies across many dealers with synthetic prices, and reports the
+build time and the latency of typical inventory queries.
+
+Usage:
+    python manage.py bench_inventory [--rows N] [--dealers N]
+"""
+
+import json
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...inventory import InventoryIndex
+
+
+class Command(BaseCommand):
+    """
+    Times InventoryIndex queries over a synthetic multi-million row set.
+    """
+
+    help = "Benchmark inventory index queries on scaled-up seed data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=3_000_000)
+        parser.add_argument("--dealers", type=int, default=1000)
+        parser.add_argument("--number", type=int, default=200)
+
+    def handle(self, *args, **options):
+        with open(settings.INVENTORY_DATA_PATH, encoding="utf-8") as file:
+            seed = json.load(file)["cars"]
+        rng = random.Random(0)
+        records = [
+            dict(
+                seed[i % len(seed)],
+                dealer_id=rng.randrange(1, options["dealers"] + 1),
+                price=rng.randrange(5_000, 90_000),
+            )
+            for i in range(options["rows"])
+        ]
+
+        start = time.perf_counter()
+        index = InventoryIndex(records)
+        self.stdout.write(
+            f"Built index over {len(index)} rows in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+        del records
+
+        cases = [
+            ("dealer only", {}),
+            ("make", {"make": "audi"}),
+            ("body + years", {"body_type": "SUV", "year_min": 2020}),
+            (
+                "all filters",
+                {
+                    "make": "Toyota",
+                    "year_min": 2018,
+                    "year_max": 2023,
+                    "max_mileage": 50_000,
+                    "price_min": 10_000,
+                    "price_max": 60_000,
+                },
+            ),
+            ("sorted by -price", {"sort": "-price"}),
+        ]
+        number = options["number"]
+        for label, filters in cases:
+            timings = []
+            for _ in range(number):
+                dealer_id = rng.randrange(1, options["dealers"] + 1)
+                start = time.perf_counter()
+                index.query(dealer_id, **filters)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            p50 = timings[len(timings) // 2] * 1e3
+            p99 = timings[int(len(timings) * 0.99) - 1] * 1e3
+            self.stdout.write(
+                f"{label:<18} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms"
+            )
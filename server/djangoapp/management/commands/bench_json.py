@@ -0,0 +1,83 @@
+"""
+Micro-benchmark for the JSON response backends.
+
+Encodes the seed data shipped in ``database/data`` the way the views do and
+reports the time per response for each installed backend, plus the bytes
+passthrough path used when relaying backend payloads.
+
+Usage:
+    python manage.py bench_json [--number N]
+"""
+
+import json
+import timeit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...responses import JSON_BACKENDS, JsonResponse, splice_json
+
+DATA_DIR = settings.BASE_DIR / "database" / "data"
+
+
+class Command(BaseCommand):
+    """
+    Times JsonResponse construction for each backend on the seed data.
+    """
+
+    help = "Benchmark JSON response encoding on the shipped data files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=200,
+            help="Number of responses to build per measurement.",
+        )
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        dealers_raw = (DATA_DIR / "dealerships.json").read_bytes()
+        reviews_raw = (DATA_DIR / "reviews.json").read_bytes()
+        # Shape the payloads the way the backend returns them: bare lists
+        dealers = json.loads(dealers_raw)["dealerships"]
+        reviews = json.loads(reviews_raw)["reviews"]
+        dealers_body = json.dumps(dealers).encode("utf-8")
+
+        cases = [
+            ("get_dealers", {"status": 200, "dealers": dealers}),
+            ("reviews", {"status": 200, "reviews": reviews}),
+        ]
+        self.stdout.write(
+            f"{'payload':<14}{'backend':<14}{'bytes':>10}{'us/resp':>12}"
+        )
+        for label, payload in cases:
+            for name, backend in JSON_BACKENDS.items():
+                size = len(backend(payload))
+                seconds = timeit.timeit(
+                    lambda backend=backend, payload=payload: backend(payload),
+                    number=number,
+                )
+                self._row(label, name, size, seconds / number)
+
+        # The relay path: decode + re-encode versus splicing the raw bytes
+        def relay_decode():
+            return JsonResponse(
+                {"status": 200, "dealers": json.loads(dealers_body)}
+            )
+
+        def relay_bytes():
+            return JsonResponse(
+                splice_json({"status": 200}, dealers=dealers_body)
+            )
+
+        relays = (("decode", relay_decode), ("passthru", relay_bytes))
+        for name, func in relays:
+            size = len(func().content)
+            seconds = timeit.timeit(func, number=number)
+            self._row("relay", name, size, seconds / number)
+
+    def _row(self, label, backend, size, seconds):
+        self.stdout.write(
+            f"{label:<14}{backend:<14}{size:>10}{seconds * 1e6:>12.1f}"
+        )
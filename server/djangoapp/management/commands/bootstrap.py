@@ -0,0 +1,117 @@
+"""
+Idempotent one-time setup for a container start.
+
+Replaces running ``migrate``, ``collectstatic`` and a superuser shell script
+on every start. Each step checks first and skips itself when there is
+nothing to do:
+
+* migrations are applied only if some are unapplied;
+* static files are collected only if the source files changed since the
+  last collection (tracked by a fingerprint file in STATIC_ROOT);
+* the superuser from DJANGO_SUPERUSER_USERNAME/PASSWORD/EMAIL is created
+  only if it does not exist yet.
+
+The Dockerfile runs the migrate and collectstatic steps at build time, so
+the image ships a migrated database, the collected files and their
+fingerprint, and a newly scheduled container skips both.
+
+Usage:
+    python manage.py bootstrap [step ...]
+"""
+
+import hashlib
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+FINGERPRINT_FILE = ".collectstatic-fingerprint"
+
+
+def static_fingerprint():
+    """
+    Returns a hash of every static source file's path, size and mtime.
+    """
+    digest = hashlib.sha256()
+    entries = []
+    for finder in get_finders():
+        for path, storage in finder.list([]):
+            stat = os.stat(storage.path(path))
+            entries.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+    for entry in sorted(entries):
+        digest.update(entry.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    """
+    Applies migrations, collects static files and creates the superuser,
+    skipping each step that has nothing to do.
+    """
+
+    help = "Idempotent container setup: migrate, collectstatic, superuser."
+
+    steps = ("migrate", "collectstatic", "superuser")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "step",
+            nargs="*",
+            help="Steps to run, in order: "
+            f"{', '.join(self.steps)}. Defaults to all of them.",
+        )
+
+    def handle(self, *args, **options):
+        names = options["step"] or self.steps
+        unknown = [name for name in names if name not in self.steps]
+        if unknown:
+            raise CommandError(f"Unknown step(s): {', '.join(unknown)}")
+        for name in names:
+            step = getattr(self, name)
+            start = time.perf_counter()
+            message = step()
+            self.stdout.write(
+                f"{step.__name__}: {message} "
+                f"({time.perf_counter() - start:.2f}s)"
+            )
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        targets = executor.loader.graph.leaf_nodes()
+        if not executor.migration_plan(targets):
+            return "up to date, skipped"
+        call_command("migrate", interactive=False, verbosity=0)
+        return "applied"
+
+    def collectstatic(self):
+        fingerprint = static_fingerprint()
+        marker = os.path.join(settings.STATIC_ROOT, FINGERPRINT_FILE)
+        try:
+            with open(marker, encoding="utf-8") as file:
+                if file.read().strip() == fingerprint:
+                    return "unchanged, skipped"
+        except FileNotFoundError:
+            pass
+        call_command("collectstatic", interactive=False, verbosity=0)
+        with open(marker, "w", encoding="utf-8") as file:
+            file.write(fingerprint)
+        return "collected"
+
+    def superuser(self):
+        username = os.environ.get("DJANGO_SUPERUSER_USERNAME")
+        password = os.environ.get("DJANGO_SUPERUSER_PASSWORD")
+        email = os.environ.get("DJANGO_SUPERUSER_EMAIL")
+        if not (username and password and email):
+            return "environment variables not set, skipped"
+        User = get_user_model()
+        if User.objects.filter(username=username).exists():
+            return f"{username} already exists, skipped"
+        User.objects.create_superuser(username, email, password)
+        return f"created {username}"
@@ -0,0 +1,128 @@
+"""
+Aggregates request profiles written by the profiling middleware.
+
+Besides the cProfile stats of the request thread, the report lists the wall
+time of upstream calls recorded next to each profile, which includes calls
+made on the upstream pool that cProfile does not see.
+
+Usage:
+    python manage.py profile_report [--view NAME] [--limit N] [--dir PATH]
+    python manage.py profile_report --token
+"""
+
+import glob
+import io
+import json
+import os
+import pstats
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...middleware import make_profile_token
+
+_FILENAME_RE = re.compile(r"-(?P<view>[^-]+)-(?P<ms>\d+)ms\.pstats$")
+
+
+class Command(BaseCommand):
+    """
+    Prints per-view durations, per-upstream call times and the top
+    cumulative functions across sampled request profiles.
+    """
+
+    help = "Aggregate pstats files written by ProfilingMiddleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir",
+            default=None,
+            help="Profile directory. Defaults to PROFILING_DIR.",
+        )
+        parser.add_argument(
+            "--view",
+            default=None,
+            help="Only include profiles whose view name contains this.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=25,
+            help="Number of functions to list.",
+        )
+        parser.add_argument(
+            "--sort",
+            default="cumulative",
+            help="pstats sort key (cumulative, tottime, ncalls, ...).",
+        )
+        parser.add_argument(
+            "--token",
+            action="store_true",
+            help="Print a signed value for the profiling request header.",
+        )
+
+    def handle(self, *args, **options):
+        if options["token"]:
+            self.stdout.write(
+                f"{settings.PROFILING_HEADER}: {make_profile_token()}"
+            )
+            return
+
+        directory = options["dir"] or settings.PROFILING_DIR
+        files = []
+        durations = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*.pstats"))):
+            match = _FILENAME_RE.search(os.path.basename(path))
+            if match is None:
+                continue
+            view = match["view"]
+            if options["view"] and options["view"] not in view:
+                continue
+            files.append(path)
+            durations.setdefault(view, []).append(int(match["ms"]))
+        if not files:
+            raise CommandError(f"No matching profiles in {directory}.")
+
+        self.stdout.write(f"{len(files)} profiles from {directory}\n")
+        self.stdout.write(
+            f"{'view':<40}{'samples':>8}{'mean ms':>10}{'max ms':>10}"
+        )
+        for view, values in sorted(durations.items()):
+            self.stdout.write(
+                f"{view:<40}{len(values):>8}"
+                f"{sum(values) / len(values):>10.0f}{max(values):>10}"
+            )
+        self.stdout.write("")
+        self.write_upstream_timings(files)
+
+        # pstats writes piecemeal, so collect its report before printing
+        report = io.StringIO()
+        stats = pstats.Stats(*files, stream=report)
+        stats.strip_dirs().sort_stats(options["sort"])
+        stats.print_stats(options["limit"])
+        self.stdout.write(report.getvalue())
+
+    def write_upstream_timings(self, files):
+        """
+        Summarizes the upstream call times saved next to the profiles.
+        """
+        upstreams = {}
+        for path in files:
+            try:
+                with open(path + ".upstream.json", encoding="utf-8") as file:
+                    calls = json.load(file)["calls"]
+            except (OSError, ValueError, KeyError):
+                continue
+            for call in calls:
+                upstreams.setdefault(call["upstream"], []).append(call["ms"])
+        if not upstreams:
+            return
+        self.stdout.write(
+            f"{'upstream':<40}{'calls':>8}{'mean ms':>10}{'max ms':>10}"
+        )
+        for upstream, values in sorted(upstreams.items()):
+            self.stdout.write(
+                f"{upstream:<40}{len(values):>8}"
+                f"{sum(values) / len(values):>10.0f}{max(values):>10.0f}"
+            )
+        self.stdout.write("")
@@ -0,0 +1,53 @@
+"""
+Rebuilds the per-dealer review sentiment counters from the backend.
+
+Usage:
+    python manage.py rebuild_sentiment [--allow-partial]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...restapis import get_request
+from ...sentiment import rebuild_sentiment_summaries
+
+
+class Command(BaseCommand):
+    """
+    Re-scores every review and replaces all DealerSentiment rows.
+
+    If any review cannot be scored the command fails and leaves the rows as
+    they were, unless ``--allow-partial`` is given.
+    """
+
+    help = "Rebuild per-dealer sentiment counters from all backend reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--allow-partial",
+            action="store_true",
+            help="Replace the counters even if some reviews were not scored.",
+        )
+
+    def handle(self, *args, **options):
+        reviews = get_request("/fetchReviews")
+        dealers = get_request("/fetchDealers")
+        if reviews is None or dealers is None:
+            raise CommandError("Could not fetch reviews or dealers.")
+
+        summaries, skipped = rebuild_sentiment_summaries(
+            reviews, dealers, allow_partial=options["allow_partial"]
+        )
+        if summaries is None:
+            raise CommandError(
+                f"{skipped} of {len(reviews)} reviews could not be scored; "
+                "sentiment counters left unchanged. Re-run, or pass "
+                "--allow-partial to write them anyway."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt sentiment for {summaries} dealers "
+                f"from {len(reviews) - skipped} reviews."
+            )
+        )
+        if skipped:
+            self.stderr.write(f"{skipped} reviews could not be scored.")
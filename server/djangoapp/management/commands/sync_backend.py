@@ -0,0 +1,51 @@
+"""
+Syncs the local read replica of dealerships and reviews from the backend.
+
+Usage:
+    python manage.py sync_backend [--full]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...replica import review_watermark, sync_dealers, sync_reviews
+from ...restapis import get_request
+
+
+class Command(BaseCommand):
+    """
+    Upserts all dealerships and pulls reviews newer than the last sync.
+    """
+
+    help = "Sync the local dealership and review replica from the backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-pull every review instead of only new ones.",
+        )
+
+    def handle(self, *args, **options):
+        dealers = get_request("/fetchDealers")
+        if dealers is None:
+            raise CommandError("Could not fetch dealerships.")
+        dealer_count = sync_dealers(dealers)
+
+        if options["full"]:
+            since_id = 0
+            reviews = get_request("/fetchReviews")
+        else:
+            since_id = review_watermark()
+            reviews = get_request("/fetchReviews", since_id=since_id)
+        if reviews is None:
+            raise CommandError("Could not fetch reviews.")
+        # Older backends ignore since_id and return everything
+        reviews = [review for review in reviews if review["id"] > since_id]
+        review_count = sync_reviews(reviews, full=options["full"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synced {dealer_count} dealerships and {review_count} "
+                f"reviews (after id {since_id})."
+            )
+        )
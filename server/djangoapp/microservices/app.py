@@ -4,7 +4,7 @@ This module contains a Flask application for sentiment analysis.
 
 import json
 
-from flask import Flask
+from flask import Flask, request
 from nltk.sentiment import SentimentIntensityAnalyzer
 
 app = Flask("Sentiment Analyzer")
@@ -21,26 +21,48 @@ def home():
     Use /analyze/text to get the sentiment"
 
 
-@app.get("/analyze/<input_txt>")
-def analyze_sentiment(input_txt):
+def classify(input_txt):
     """
-    This function analyzes the sentiment of the input text.
+    This function returns the sentiment label and compound score of a text.
     """
     scores = sia.polarity_scores(input_txt)
-    print(scores)
     pos = float(scores["pos"])
     neg = float(scores["neg"])
     neu = float(scores["neu"])
     res = "positive"
-    print("pos neg nue ", pos, neg, neu)
     if neg > pos and neg > neu:
         res = "negative"
     elif neu > neg and neu > pos:
         res = "neutral"
-    res = json.dumps({"sentiment": res})
+    return {"sentiment": res, "compound": scores["compound"]}
+
+
+@app.get("/analyze/<input_txt>")
+def analyze_sentiment(input_txt):
+    """
+    This function analyzes the sentiment of the input text.
+    """
+    res = json.dumps(classify(input_txt))
     print(res)
     return res
 
 
+@app.post("/analyze_batch")
+def analyze_sentiment_batch():
+    """
+    This function analyzes the sentiment of several texts at once.
+
+    It expects a JSON body of the form {"texts": [...]} and returns
+    {"results": [...]} with one result per text, in order.
+    """
+    body = request.get_json(silent=True) or {}
+    texts = body.get("texts")
+    if not isinstance(texts, list):
+        return json.dumps({"error": "texts must be a list"}), 400
+    res = json.dumps({"results": [classify(str(text)) for text in texts]})
+    print(f"analyzed batch of {len(texts)}")
+    return res
+
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,361 @@
+"""
+Middleware for the djangoapp application.
+
+This module provides response compression for the JSON API, and admission
+control for the views that fan out to upstream services. Responses are
+compressed with Brotli (when the ``brotli`` package is installed) or gzip,
+depending on what the client accepts, once they exceed a configurable size
+threshold. Admission control applies per-client token-bucket limits and a
+concurrency cap shared by the workers through the rate-limit store,
+rejecting excess requests immediately instead of letting them queue inside
+gunicorn. The opt-in profiling middleware runs
+selected requests under cProfile and saves their stats for later analysis.
+"""
+
+import cProfile
+import gzip
+import json
+import math
+import os
+import random
+import re
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.module_loading import import_string
+
+from .responses import JsonResponse
+from .restapis import upstream_timings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def _accepted_encodings(header):
+    """
+    Parses an ``Accept-Encoding`` header into the set of acceptable codings.
+
+    Codings listed with ``q=0`` are treated as refused.
+    """
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def compress_gzip(content, level):
+    """
+    Compresses ``content`` with gzip at the given level.
+    """
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def compress_brotli(content, level):
+    """
+    Compresses ``content`` with Brotli at the given quality level.
+    """
+    return brotli.compress(content, quality=level)
+
+
+class CompressionMiddleware:
+    """
+    Compresses API responses above a size threshold with Brotli or gzip.
+
+    Only content types listed in ``COMPRESSION_CONTENT_TYPES`` are
+    compressed. Streaming responses, responses that already carry a
+    ``Content-Encoding`` and bodies smaller than ``COMPRESSION_MIN_SIZE``
+    bytes are passed through unchanged.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+        self.content_types = tuple(
+            getattr(
+                settings, "COMPRESSION_CONTENT_TYPES", ["application/json"]
+            )
+        )
+        self.gzip_level = getattr(settings, "COMPRESSION_GZIP_LEVEL", 6)
+        self.brotli_level = getattr(settings, "COMPRESSION_BROTLI_LEVEL", 4)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def select_encoding(self, request):
+        """
+        Returns the coding to use for this request, or None.
+        """
+        accepted = _accepted_encodings(
+            request.headers.get("Accept-Encoding", "")
+        )
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0]
+        if content_type.strip().lower() not in self.content_types:
+            return response
+
+        # The body varies with Accept-Encoding from here on, whether or not
+        # this particular response ends up compressed.
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if len(response.content) < self.min_size:
+            return response
+        encoding = self.select_encoding(request)
+        if encoding is None:
+            return response
+
+        if encoding == "br":
+            compressed = compress_brotli(response.content, self.brotli_level)
+        else:
+            compressed = compress_gzip(response.content, self.gzip_level)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+
+        # The compressed body is no longer byte-identical to what a strong
+        # ETag describes, so downgrade it to a weak one.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+
+class AdmissionControlMiddleware:
+    """
+    Rate-limits and load-sheds the upstream-heavy views.
+
+    Views are identified by their function name. Each view listed in
+    ``RATE_LIMITS`` gets a token bucket per client (the user id when logged
+    in, otherwise the address from ``client_address``) with the configured
+    ``rate`` (tokens per second) and ``burst``; a client that runs out gets
+    ``429``. Views listed in ``UPSTREAM_HEAVY_VIEWS`` additionally share a
+    cap of ``UPSTREAM_CONCURRENCY_LIMIT`` in-flight requests; requests over
+    the cap get ``503``. Both responses carry ``Retry-After``. The cap is
+    checked first, so a shed request does not cost the client a token.
+
+    Buckets and slots are kept in the store named by ``RATE_LIMIT_STORE``,
+    which decides whether the limits are per worker or shared.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limits = getattr(settings, "RATE_LIMITS", {})
+        self.heavy_views = frozenset(
+            getattr(settings, "UPSTREAM_HEAVY_VIEWS", ())
+        )
+        self.store = import_string(
+            getattr(
+                settings,
+                "RATE_LIMIT_STORE",
+                "djangoapp.ratelimit.LocalMemoryStore",
+            )
+        )()
+        self.trusted_proxies = getattr(
+            settings, "RATE_LIMIT_TRUSTED_PROXIES", 0
+        )
+        self.client_ip_header = getattr(
+            settings, "RATE_LIMIT_CLIENT_IP_HEADER", ""
+        )
+        self.concurrency_limit = getattr(
+            settings, "UPSTREAM_CONCURRENCY_LIMIT", 16
+        )
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            slot = getattr(request, "_admission_slot", None)
+            if slot is not None:
+                request._admission_slot = None
+                self.store.release(slot)
+
+    def client_key(self, request):
+        """
+        Returns the identity a request is rate-limited under.
+        """
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{self.client_address(request)}"
+
+    def client_address(self, request):
+        """
+        Returns the client IP address as reported by the trusted proxies.
+
+        ``RATE_LIMIT_CLIENT_IP_HEADER`` is used when set and present.
+        Otherwise, with ``RATE_LIMIT_TRUSTED_PROXIES`` set to N, the address
+        is the Nth X-Forwarded-For entry from the right: each trusted proxy
+        appends the address it saw, and entries further left were supplied
+        by the client. Without trusted proxies it is ``REMOTE_ADDR``.
+        """
+        if self.client_ip_header:
+            address = request.headers.get(self.client_ip_header, "").strip()
+            if address:
+                return address
+        if self.trusted_proxies > 0:
+            header = request.headers.get("X-Forwarded-For", "")
+            forwarded = [
+                entry.strip() for entry in header.split(",") if entry.strip()
+            ]
+            if forwarded:
+                # Fewer entries than proxies means some were bypassed; the
+                # left-most entry is then the furthest address we know of.
+                return forwarded[-min(self.trusted_proxies, len(forwarded))]
+        return request.META.get("REMOTE_ADDR", "")
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = getattr(view_func, "__name__", "")
+
+        slot = None
+        if view_name in self.heavy_views:
+            slot = self.store.acquire("upstream", self.concurrency_limit)
+            if slot is None:
+                return self._reject(503, "Service Unavailable", 1)
+
+        limit = self.limits.get(view_name)
+        if limit is not None:
+            key = f"{view_name}:{self.client_key(request)}"
+            allowed, retry_after = self.store.consume(
+                key, limit["rate"], limit["burst"]
+            )
+            if not allowed:
+                if slot is not None:
+                    self.store.release(slot)
+                return self._reject(429, "Too Many Requests", retry_after)
+
+        request._admission_slot = slot
+        return None
+
+    def _reject(self, status, message, retry_after):
+        response = JsonResponse(
+            {"status": status, "message": message}, status=status
+        )
+        response["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
+
+
+PROFILE_TOKEN_SALT = "djangoapp.profiling"
+
+
+def make_profile_token():
+    """
+    Returns a signed value for the profiling request header.
+
+    The token is valid for ``PROFILING_TOKEN_MAX_AGE`` seconds.
+    """
+    return signing.dumps("profile", salt=PROFILE_TOKEN_SALT)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles selected requests with cProfile and writes pstats files.
+
+    The middleware is only installed when ``PROFILING_ENABLED`` is set;
+    otherwise Django drops it at startup, so it costs nothing. When enabled,
+    a request is profiled if it carries a valid signed token (see
+    ``make_profile_token``) in the ``PROFILING_HEADER`` header, or if it is
+    picked by the ``PROFILING_SAMPLE_RATE`` (0-1) sample.
+
+    Each profile is written to ``PROFILING_DIR`` as
+    ``<time>-<pid>-<view>-<duration>ms.pstats``. Aggregate them with
+    ``manage.py profile_report``.
+
+    cProfile only sees the request thread, so upstream calls made on the
+    upstream pool are invisible to it and the request thread's wait for them
+    shows up as lock acquisition. The wall time of every upstream call made
+    for the request, on any thread, is therefore also written next to the
+    profile as ``<same name>.upstream.json``.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        self.header = getattr(settings, "PROFILING_HEADER", "X-Profile")
+        self.token_max_age = getattr(settings, "PROFILING_TOKEN_MAX_AGE", 3600)
+        self.directory = settings.PROFILING_DIR
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return self.get_response(request)
+        timings = []
+        token = upstream_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            upstream_timings.reset(token)
+        duration_ms = (time.perf_counter() - start) * 1000
+        self.save(profiler, request, duration_ms, timings)
+        return response
+
+    def should_profile(self, request):
+        """
+        Returns True if this request was asked for or sampled.
+        """
+        token = request.headers.get(self.header)
+        if token:
+            try:
+                signing.loads(
+                    token, salt=PROFILE_TOKEN_SALT, max_age=self.token_max_age
+                )
+                return True
+            except signing.BadSignature:
+                pass
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def save(self, profiler, request, duration_ms, timings=()):
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        view = re.sub(r"[^A-Za-z0-9_.]", "_", view)
+        path = os.path.join(
+            self.directory,
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{view}-"
+            f"{duration_ms:.0f}ms.pstats",
+        )
+        profiler.dump_stats(path)
+        calls = [
+            {"upstream": upstream, "ms": round(seconds * 1000, 2)}
+            for upstream, seconds in timings
+        ]
+        with open(path + ".upstream.json", "w", encoding="utf-8") as file:
+            json.dump({"duration_ms": duration_ms, "calls": calls}, file)
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DealerSentiment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dealer_id', models.IntegerField(unique=True)),
+                ('state', models.CharField(blank=True, default='', max_length=100)),
+                ('positive', models.PositiveIntegerField(default=0)),
+                ('neutral', models.PositiveIntegerField(default=0)),
+                ('negative', models.PositiveIntegerField(default=0)),
+                ('compound_total', models.FloatField(default=0.0)),
+                ('positive_ratio', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['state', '-positive_ratio'], name='sentiment_state_ratio_idx'), models.Index(fields=['-positive_ratio'], name='sentiment_ratio_idx')],
+            },
+        ),
+    ]
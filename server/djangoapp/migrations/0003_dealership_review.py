@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0002_dealersentiment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Dealership',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('city', models.CharField(max_length=100)),
+                ('state', models.CharField(max_length=100)),
+                ('st', models.CharField(max_length=10)),
+                ('address', models.CharField(max_length=200)),
+                ('zip', models.CharField(max_length=20)),
+                ('lat', models.FloatField(null=True)),
+                ('long', models.FloatField(null=True)),
+                ('short_name', models.CharField(max_length=100)),
+                ('full_name', models.CharField(max_length=200)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['state'], name='dealership_state_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('dealership', models.IntegerField()),
+                ('review', models.TextField()),
+                ('purchase', models.BooleanField(default=False)),
+                ('purchase_date', models.CharField(blank=True, max_length=20)),
+                ('car_make', models.CharField(blank=True, max_length=100)),
+                ('car_model', models.CharField(blank=True, max_length=100)),
+                ('car_year', models.IntegerField(null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dealership', 'id'], name='review_dealer_idx')],
+            },
+        ),
+    ]
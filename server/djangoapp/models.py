@@ -38,3 +38,182 @@ class CarModel(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class DealerSentiment(models.Model):
+    """
+    This class defines the DealerSentiment model.
+
+    It holds precomputed review sentiment counters for one dealer, so the
+    dealer page and the state leaderboard can be served without re-scoring
+    every review.
+    """
+
+    dealer_id = models.IntegerField(unique=True)
+    state = models.CharField(max_length=100, blank=True, default="")
+    positive = models.PositiveIntegerField(default=0)
+    neutral = models.PositiveIntegerField(default=0)
+    negative = models.PositiveIntegerField(default=0)
+    compound_total = models.FloatField(default=0.0)
+    # Denormalized positive / total, kept in sync by recalculate() so the
+    # leaderboard can be read straight off the (state, ratio) index.
+    positive_ratio = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["state", "-positive_ratio"],
+                name="sentiment_state_ratio_idx",
+            ),
+            models.Index(
+                fields=["-positive_ratio"], name="sentiment_ratio_idx"
+            ),
+        ]
+
+    @property
+    def total(self):
+        """
+        Returns the number of scored reviews.
+        """
+        return self.positive + self.neutral + self.negative
+
+    @property
+    def average_compound(self):
+        """
+        Returns the mean VADER compound score of the scored reviews.
+        """
+        return self.compound_total / self.total if self.total else 0.0
+
+    def recalculate(self):
+        """
+        Refreshes the denormalized positive ratio from the counters.
+        """
+        self.positive_ratio = self.positive / self.total if self.total else 0.0
+
+    def as_dict(self):
+        """
+        Returns the counters as a JSON-serializable dict.
+        """
+        return {
+            "dealer_id": self.dealer_id,
+            "state": self.state,
+            "positive": self.positive,
+            "neutral": self.neutral,
+            "negative": self.negative,
+            "total": self.total,
+            "positive_ratio": round(self.positive_ratio, 4),
+            "average_compound": round(self.average_compound, 4),
+        }
+
+    def __str__(self):
+        return f"Dealer {self.dealer_id} sentiment"
+
+
+class Dealership(models.Model):
+    """
+    This class defines the Dealership model.
+
+    It is a local read replica of the backend's dealerships, keyed by the
+    backend id and kept up to date by ``manage.py sync_backend``.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    city = models.CharField(max_length=100)
+    state = models.CharField(max_length=100)
+    st = models.CharField(max_length=10)
+    address = models.CharField(max_length=200)
+    zip = models.CharField(max_length=20)
+    lat = models.FloatField(null=True)
+    long = models.FloatField(null=True)
+    short_name = models.CharField(max_length=100)
+    full_name = models.CharField(max_length=200)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["state"], name="dealership_state_idx"),
+        ]
+
+    def as_dict(self):
+        """
+        Returns the dealership in the backend's JSON shape.
+        """
+        return {
+            "id": self.id,
+            "city": self.city,
+            "state": self.state,
+            "st": self.st,
+            "address": self.address,
+            "zip": self.zip,
+            "lat": self.lat,
+            "long": self.long,
+            "short_name": self.short_name,
+            "full_name": self.full_name,
+        }
+
+    def __str__(self):
+        return self.full_name
+
+
+class Review(models.Model):
+    """
+    This class defines the Review model.
+
+    It is a local read replica of the backend's reviews, keyed by the
+    backend id. ``dealership`` holds the backend dealer id as a plain
+    integer, since reviews may arrive before their dealership is synced.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    name = models.CharField(max_length=200)
+    dealership = models.IntegerField()
+    review = models.TextField()
+    purchase = models.BooleanField(default=False)
+    purchase_date = models.CharField(max_length=20, blank=True)
+    car_make = models.CharField(max_length=100, blank=True)
+    car_model = models.CharField(max_length=100, blank=True)
+    car_year = models.IntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["dealership", "id"], name="review_dealer_idx"
+            ),
+        ]
+
+    def as_dict(self):
+        """
+        Returns the review in the backend's JSON shape.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "dealership": self.dealership,
+            "review": self.review,
+            "purchase": self.purchase,
+            "purchase_date": self.purchase_date,
+            "car_make": self.car_make,
+            "car_model": self.car_model,
+            "car_year": self.car_year,
+        }
+
+    def __str__(self):
+        return f"Review {self.id} of dealer {self.dealership}"
+
+
+class ReplicaSyncState(models.Model):
+    """
+    This class defines the ReplicaSyncState model.
+
+    It records how far ``manage.py sync_backend`` has pulled each replicated
+    collection. Only the sync moves ``last_id``; reviews written through
+    from ``add_review`` do not, so a review posted elsewhere with a lower id
+    is still picked up by the next incremental sync.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} synced to {self.last_id}"
@@ -0,0 +1,269 @@
+"""
+Token-bucket and concurrency-slot stores for admission control.
+
+A store keeps one bucket per key (client and view) and answers whether a
+request may consume a token. It also counts in-flight requests against a
+concurrency cap. ``LocalMemoryStore`` is the default: it keeps buckets in
+the worker process and shares the cap between all workers on the host
+through lock files. ``CacheStore`` keeps both in a Django cache so that
+limits are shared by every worker using that cache. Other stores can be
+plugged in through the ``RATE_LIMIT_STORE`` setting.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class BaseStore:
+    """
+    Interface for token-bucket stores.
+    """
+
+    def consume(self, key, rate, burst):
+        """
+        Takes one token from the bucket for ``key`` if one is available.
+
+        Buckets start full with ``burst`` tokens and refill at ``rate``
+        tokens per second, up to ``burst``.
+
+        Args:
+            key (str): The bucket to draw from.
+            rate (float): Refill rate in tokens per second.
+            burst (int): Bucket capacity.
+
+        Returns:
+            tuple: ``(allowed, retry_after)`` where ``retry_after`` is the
+                   number of seconds until a token will be available when
+                   the request is not allowed, and 0 otherwise.
+        """
+        raise NotImplementedError
+
+    def acquire(self, name, limit):
+        """
+        Takes one of ``limit`` concurrency slots for ``name`` if one is free.
+
+        Args:
+            name (str): The group of requests sharing the cap.
+            limit (int): Maximum in-flight requests in the group.
+
+        Returns:
+            object or None: A handle to pass to ``release``, or None if every
+                            slot is taken.
+        """
+        raise NotImplementedError
+
+    def release(self, slot):
+        """
+        Frees a slot returned by ``acquire``.
+        """
+        raise NotImplementedError
+
+
+def _refill(tokens, updated, rate, burst, now):
+    """
+    Returns the bucket's token count after refilling up to ``now``.
+    """
+    return min(burst, tokens + (now - updated) * rate)
+
+
+def _take(tokens, rate):
+    """
+    Returns ``(allowed, tokens_left, retry_after)`` for one request.
+    """
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / rate
+
+
+class _FileSlots:
+    """
+    Concurrency slots shared by every process on the host.
+
+    Each slot is a lock file held with ``flock`` while a request is in
+    flight. The kernel drops the lock when the file is closed or its process
+    dies, so a killed worker cannot leak a slot.
+    """
+
+    def __init__(self, directory):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def acquire(self, name, limit):
+        # Probe from a random slot so concurrent requests rarely collide
+        start = random.randrange(limit)
+        for offset in range(limit):
+            path = os.path.join(
+                self._directory, f"{name}.{(start + offset) % limit}"
+            )
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    def release(self, fd):
+        os.close(fd)
+
+
+class LocalMemoryStore(BaseStore):
+    """
+    Keeps buckets in a dict in the current process.
+
+    Buckets that have refilled completely are dropped periodically, so
+    memory use is bounded by the number of recently active clients. They
+    are per process: with several workers a client may burst once per
+    worker.
+
+    The concurrency cap is shared by all workers on the host through lock
+    files in ``slot_dir``. Where ``fcntl`` is unavailable it falls back to
+    counting the current process's requests only.
+
+    Args:
+        prune_interval (float, optional): Seconds between bucket prunes.
+        slot_dir (str, optional): Directory for the slot lock files.
+                                  Defaults to the ``RATE_LIMIT_SLOT_DIR``
+                                  setting.
+    """
+
+    def __init__(self, prune_interval=60.0, slot_dir=None):
+        self._buckets = {}  # key -> (tokens, updated, rate, burst)
+        self._in_flight = {}  # name -> requests holding a slot
+        self._lock = threading.Lock()
+        self._prune_interval = prune_interval
+        self._last_prune = time.monotonic()
+        self._slots = None
+        if fcntl is not None:
+            if slot_dir is None:
+                slot_dir = getattr(
+                    settings, "RATE_LIMIT_SLOT_DIR", "/tmp/djangoapp-slots"
+                )
+            self._slots = _FileSlots(slot_dir)
+
+    def consume(self, key, rate, burst):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = burst
+            else:
+                tokens = _refill(bucket[0], bucket[1], rate, burst, now)
+            allowed, tokens, retry_after = _take(tokens, rate)
+            self._buckets[key] = (tokens, now, rate, burst)
+            if now - self._last_prune >= self._prune_interval:
+                self._prune(now)
+            return allowed, retry_after
+
+    def acquire(self, name, limit):
+        if self._slots is not None:
+            return self._slots.acquire(name, limit)
+        with self._lock:
+            count = self._in_flight.get(name, 0)
+            if count >= limit:
+                return None
+            self._in_flight[name] = count + 1
+            return name
+
+    def release(self, slot):
+        if self._slots is not None:
+            self._slots.release(slot)
+            return
+        with self._lock:
+            self._in_flight[slot] -= 1
+
+    def _prune(self, now):
+        self._last_prune = now
+        self._buckets = {
+            key: bucket
+            for key, bucket in self._buckets.items()
+            if _refill(bucket[0], bucket[1], bucket[2], bucket[3], now)
+            < bucket[3]
+        }
+
+
+class CacheStore(BaseStore):
+    """
+    Keeps buckets and concurrency slots in a Django cache.
+
+    Limits hold across every worker (and pod) sharing the cache, so it needs
+    a shared backend such as Redis or Memcached to be useful. Bucket
+    reads and writes are not atomic, so concurrent requests from the same
+    client may occasionally both be admitted; this store trades that
+    precision for limits that hold across processes. Slots are separate
+    keys claimed with the cache's atomic ``add`` and expire after
+    ``slot_timeout`` seconds, so a worker killed mid-request cannot leak
+    one for good.
+
+    Cache errors are logged and the request is admitted, so a cache outage
+    does not take the views down with it.
+
+    Args:
+        alias (str, optional): The cache alias to use. Defaults to the
+                               ``RATE_LIMIT_CACHE`` setting, or
+                               ``"default"``.
+        slot_timeout (int, optional): Seconds before an unreleased slot
+                                      frees itself. Defaults to 60.
+    """
+
+    def __init__(self, alias=None, slot_timeout=60):
+        if alias is None:
+            alias = getattr(settings, "RATE_LIMIT_CACHE", "default")
+        self._cache = caches[alias]
+        self._slot_timeout = slot_timeout
+
+    def consume(self, key, rate, burst):
+        now = time.time()
+        cache_key = f"ratelimit:{key}"
+        try:
+            bucket = self._cache.get(cache_key)
+        except Exception:
+            logger.exception("Rate-limit cache unavailable; admitting")
+            return True, 0.0
+        if bucket is None:
+            tokens = burst
+        else:
+            tokens = _refill(bucket[0], bucket[1], rate, burst, now)
+        allowed, tokens, retry_after = _take(tokens, rate)
+        # Expire once the bucket would have refilled completely anyway
+        timeout = max(1, int((burst - tokens) / rate) + 1)
+        try:
+            self._cache.set(cache_key, (tokens, now), timeout)
+        except Exception:
+            logger.exception("Rate-limit cache unavailable")
+        return allowed, retry_after
+
+    def acquire(self, name, limit):
+        # Probe from a random slot so concurrent requests rarely collide
+        start = random.randrange(limit)
+        try:
+            for offset in range(limit):
+                key = f"ratelimit-slot:{name}:{(start + offset) % limit}"
+                if self._cache.add(key, 1, self._slot_timeout):
+                    return key
+        except Exception:
+            logger.exception("Rate-limit cache unavailable; admitting")
+            return ""
+        return None
+
+    def release(self, slot):
+        if not slot:
+            return
+        try:
+            self._cache.delete(slot)
+        except Exception:
+            logger.exception("Could not release slot %s", slot)
@@ -0,0 +1,173 @@
+"""
+Local read replica of the backend's dealerships and reviews.
+
+The ``Dealership`` and ``Review`` models mirror the backend collections.
+``manage.py sync_backend`` fills them: dealerships are upserted in full
+(they are few), reviews are pulled incrementally from the highest id the
+previous sync received. That watermark is kept in ``ReplicaSyncState``
+rather than derived from the table, because ``add_review`` also writes
+reviews straight into the replica and may get ahead of reviews posted
+elsewhere. When ``LOCAL_REPLICA_READS`` is enabled the dealer and review
+views read from these tables and fall back to the backend when the replica
+has nothing for a query.
+"""
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Dealership, ReplicaSyncState, Review
+
+DEALERSHIP_FIELDS = [
+    "city",
+    "state",
+    "st",
+    "address",
+    "zip",
+    "lat",
+    "long",
+    "short_name",
+    "full_name",
+]
+REVIEW_FIELDS = [
+    "name",
+    "dealership",
+    "review",
+    "purchase",
+    "purchase_date",
+    "car_make",
+    "car_model",
+    "car_year",
+]
+
+
+def replica_enabled():
+    """
+    Returns True if views should read from the local replica.
+    """
+    return getattr(settings, "LOCAL_REPLICA_READS", False)
+
+
+def get_replica_dealers(state="All"):
+    """
+    Returns dealerships from the replica, optionally filtered by state.
+
+    Args:
+        state (str, optional): The state to filter by. Defaults to "All".
+
+    Returns:
+        list: Dealership dicts in the backend's shape, ordered by id.
+    """
+    dealers = Dealership.objects.order_by("id")
+    if state != "All":
+        dealers = dealers.filter(state=state)
+    return [dealer.as_dict() for dealer in dealers]
+
+
+def get_replica_dealer(dealer_id):
+    """
+    Returns a dealership from the replica as a one-item list (or empty).
+    """
+    return [
+        dealer.as_dict() for dealer in Dealership.objects.filter(id=dealer_id)
+    ]
+
+
+def get_replica_reviews(dealer_id):
+    """
+    Returns a dealership's reviews from the replica, ordered by id.
+    """
+    reviews = Review.objects.filter(dealership=dealer_id).order_by("id")
+    return [review.as_dict() for review in reviews]
+
+
+def _review(data):
+    return Review(
+        id=data["id"],
+        name=data.get("name", ""),
+        dealership=data["dealership"],
+        review=data.get("review", ""),
+        purchase=bool(data.get("purchase")),
+        purchase_date=data.get("purchase_date") or "",
+        car_make=data.get("car_make") or "",
+        car_model=data.get("car_model") or "",
+        car_year=data.get("car_year"),
+    )
+
+
+def store_review(data):
+    """
+    Writes a newly posted review to the replica.
+
+    Args:
+        data (dict or None): The review as saved by the backend.
+    """
+    if isinstance(data, dict) and data.get("id") is not None:
+        _review(data).save()
+
+
+def review_watermark():
+    """
+    Returns the highest review id pulled by a sync, or 0 before the first.
+    """
+    state = ReplicaSyncState.objects.filter(name="reviews").first()
+    return state.last_id if state else 0
+
+
+def sync_dealers(dealers):
+    """
+    Upserts all dealerships into the replica.
+
+    Args:
+        dealers (list): Dealerships as returned by ``/fetchDealers``.
+
+    Returns:
+        int: The number of dealerships written.
+    """
+    rows = [
+        Dealership(
+            id=dealer["id"],
+            **{field: dealer.get(field) for field in DEALERSHIP_FIELDS},
+        )
+        for dealer in dealers
+    ]
+    Dealership.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=DEALERSHIP_FIELDS,
+        batch_size=500,
+    )
+    return len(rows)
+
+
+def sync_reviews(reviews, full=False):
+    """
+    Upserts reviews into the replica and advances the sync watermark.
+
+    Args:
+        reviews (list): Reviews as returned by ``/fetchReviews``.
+        full (bool, optional): If True, the replica's reviews are replaced
+                               so that it matches ``reviews`` exactly, and
+                               the watermark is reset to their highest id.
+
+    Returns:
+        int: The number of reviews written.
+    """
+    rows = [_review(review) for review in reviews]
+    with transaction.atomic():
+        if full:
+            Review.objects.all().delete()
+        Review.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=REVIEW_FIELDS,
+            batch_size=500,
+        )
+        last_id = max((row.id for row in rows), default=0)
+        if not full:
+            last_id = max(last_id, review_watermark())
+        ReplicaSyncState.objects.update_or_create(
+            name="reviews", defaults={"last_id": last_id}
+        )
+    return len(rows)
@@ -0,0 +1,153 @@
+"""
+JSON response helpers for the djangoapp views.
+
+This module provides a drop-in replacement for Django's ``JsonResponse``
+whose encoder backend is pluggable. The stdlib ``json`` module is always
+available; ``orjson`` is used when it is installed and selected (or when the
+backend is left on ``"auto"``). The response also accepts pre-encoded bytes,
+so JSON that is only forwarded from the backend service can be relayed
+without a decode/re-encode round trip.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
+def _dumps_stdlib(data, encoder=DjangoJSONEncoder, **json_dumps_params):
+    """
+    Encodes ``data`` with the stdlib ``json`` module.
+    """
+    return json.dumps(data, cls=encoder, **json_dumps_params).encode("utf-8")
+
+
+def _dumps_orjson(data, encoder=DjangoJSONEncoder, **json_dumps_params):
+    """
+    Encodes ``data`` with ``orjson``.
+
+    ``orjson`` does not understand ``json.dumps`` keyword arguments, so calls
+    that pass any fall back to the stdlib encoder to keep their output exact.
+    """
+    if json_dumps_params:
+        return _dumps_stdlib(data, encoder, **json_dumps_params)
+    return orjson.dumps(
+        data,
+        default=encoder().default,
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+JSON_BACKENDS = {"stdlib": _dumps_stdlib}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = _dumps_orjson
+
+
+def get_json_backend(name=None):
+    """
+    Returns the encoder function for the configured JSON backend.
+
+    Args:
+        name (str, optional): The backend to use. Defaults to the
+                              ``JSON_RESPONSE_BACKEND`` setting. ``"auto"``
+                              selects the fastest installed backend.
+
+    Returns:
+        callable: A function ``(data, encoder, **params) -> bytes``.
+
+    Raises:
+        ValueError: If the named backend is unknown or not installed.
+    """
+    if name is None:
+        name = getattr(settings, "JSON_RESPONSE_BACKEND", "auto")
+    if name == "auto":
+        name = "orjson" if "orjson" in JSON_BACKENDS else "stdlib"
+    try:
+        return JSON_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown or unavailable JSON backend: {name!r}"
+        ) from None
+
+
+def dumps(data, encoder=DjangoJSONEncoder, **json_dumps_params):
+    """
+    Encodes ``data`` to JSON bytes with the configured backend.
+    """
+    return get_json_backend()(data, encoder, **json_dumps_params)
+
+
+def splice_json(envelope, **raw_members):
+    """
+    Builds a JSON object from a dict plus members that are already encoded.
+
+    This lets a view wrap an upstream payload in its response envelope, e.g.
+    ``{"status": 200, "dealers": [...]}``, without parsing the payload.
+
+    Args:
+        envelope (dict): Members to encode normally.
+        **raw_members: Members whose values are pre-encoded JSON bytes.
+                       ``None`` is emitted as ``null``.
+
+    Returns:
+        bytes: The encoded JSON object.
+    """
+    body = bytearray(dumps(envelope))
+    del body[-1]  # drop the closing brace
+    separator = b"," if envelope else b""
+    for key, raw in raw_members.items():
+        body += separator
+        body += dumps(key)
+        body += b":"
+        body += b"null" if raw is None else bytes(raw)
+        separator = b","
+    body += b"}"
+    return bytes(body)
+
+
+class JsonResponse(HttpResponse):
+    """
+    An HTTP response class that consumes data to be serialized to JSON.
+
+    This mirrors ``django.http.JsonResponse`` but encodes with the backend
+    selected by ``JSON_RESPONSE_BACKEND`` and passes ``bytes`` content
+    through untouched.
+
+    Args:
+        data: The data to serialize, or pre-encoded JSON bytes.
+        encoder (type, optional): The ``JSONEncoder`` subclass whose
+                                  ``default`` handles unsupported types.
+        safe (bool, optional): If True, only ``dict`` objects (or bytes) are
+                               accepted. Defaults to True.
+        json_dumps_params (dict, optional): Keyword arguments for
+                                            ``json.dumps``.
+        **kwargs: Passed on to ``HttpResponse``.
+    """
+
+    def __init__(
+        self,
+        data,
+        encoder=DjangoJSONEncoder,
+        safe=True,
+        json_dumps_params=None,
+        **kwargs,
+    ):
+        if isinstance(data, _BYTES_TYPES):
+            content = bytes(data)
+        else:
+            if safe and not isinstance(data, dict):
+                raise TypeError(
+                    "In order to allow non-dict objects to be serialized "
+                    "set the safe parameter to False."
+                )
+            content = dumps(data, encoder, **(json_dumps_params or {}))
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=content, **kwargs)
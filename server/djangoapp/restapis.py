@@ -1,4 +1,11 @@
+import contextvars
+import json
 import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, SimpleQueue
 from urllib.parse import quote, urlencode, urljoin
 
 import requests
@@ -11,14 +18,276 @@ sentiment_analyzer_url = os.getenv(
     "SENTIMENT_ANALYZER_URL", "http://sentiment-analyzer-service:5050"
 )
 
+# Wall time of each upstream call made for the current request, as
+# (upstream, seconds) pairs. Only collected while a list is set, which the
+# profiling middleware does for the requests it profiles.
+upstream_timings = contextvars.ContextVar("upstream_timings", default=None)
 
-def get_request(endpoint, **kwargs):
+
+def _record_timing(upstream, seconds):
+    timings = upstream_timings.get()
+    if timings is not None:
+        timings.append((upstream, seconds))
+
+
+class _ContextThreadPoolExecutor(ThreadPoolExecutor):
     """
-    Performs a GET request to the specified endpoint of the backend service.
+    A thread pool that runs each task in a copy of the submitter's context.
+
+    This lets calls made on the pool be attributed to the request that
+    submitted them, e.g. in ``upstream_timings``.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+# Shared pool for issuing upstream calls concurrently from a single request
+upstream_executor = _ContextThreadPoolExecutor(
+    max_workers=int(os.getenv("UPSTREAM_MAX_WORKERS", "8")),
+    thread_name_prefix="upstream",
+)
+
+# Seconds to wait for an upstream before counting the call as failed
+upstream_timeout = float(os.getenv("UPSTREAM_TIMEOUT", "5"))
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of calling an upstream whose circuit is open.
+    """
+
 
-    This function constructs the request URL, safely joins the base URL with the
-    endpoint, and encodes any provided keyword arguments as query parameters.
-    It then executes the GET request and returns the JSON response.
+class CircuitBreaker:
+    """
+    A failure-rate circuit breaker for one upstream service.
+
+    The breaker tracks the outcome of the last ``window_size`` calls. Once at
+    least ``min_calls`` have been seen and the share of failures reaches
+    ``failure_rate``, it opens and rejects calls for ``cooldown`` seconds.
+    It then goes half-open and lets a single trial call through: success
+    closes the circuit, failure opens it for another cooldown.
+
+    Args:
+        name (str): The upstream name, used in logs and the status endpoint.
+        failure_rate (float): Failure share (0-1) that opens the circuit.
+        window_size (int): Number of recent calls considered.
+        min_calls (int): Calls needed in the window before it can open.
+        cooldown (float): Seconds to stay open before going half-open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, name, failure_rate=0.5, window_size=20, min_calls=5, cooldown=30
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._outcomes = deque(maxlen=window_size)  # True for a failure
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _current_state(self):
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.cooldown
+        ):
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        print(f"Circuit for {self.name} opened")
+
+    def _close(self):
+        self._state = self.CLOSED
+        self._outcomes.clear()
+        print(f"Circuit for {self.name} closed")
+
+    @property
+    def state(self):
+        """
+        Returns the current state, moving from open to half-open on expiry.
+        """
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self):
+        """
+        Returns True if a call may be made to the upstream now.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        """
+        Records a successful call, closing a half-open circuit.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                self._close()
+            elif state == self.CLOSED:
+                self._outcomes.append(False)
+
+    def record_failure(self):
+        """
+        Records a failed call, opening the circuit if the window trips.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                self._open()
+            elif state == self.CLOSED:
+                self._outcomes.append(True)
+                failures = sum(self._outcomes)
+                if (
+                    len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate
+                ):
+                    self._open()
+
+    def snapshot(self):
+        """
+        Returns the breaker's state and recent statistics as a dict.
+        """
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            failures = sum(self._outcomes)
+            retry_in = 0.0
+            if state == self.OPEN:
+                retry_in = max(
+                    0.0, self.cooldown - (time.monotonic() - self._opened_at)
+                )
+            return {
+                "name": self.name,
+                "state": state,
+                "calls": calls,
+                "failures": failures,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "rejected": self._rejected,
+                "retry_in": round(retry_in, 2),
+            }
+
+
+def _breaker_from_env(name):
+    """
+    Builds a breaker configured by ``<NAME>_CIRCUIT_*`` environment
+    variables, falling back to the shared ``CIRCUIT_*`` ones.
+    """
+
+    def setting(key, default):
+        prefix = name.upper()
+        return os.getenv(
+            f"{prefix}_CIRCUIT_{key}", os.getenv(f"CIRCUIT_{key}", default)
+        )
+
+    return CircuitBreaker(
+        name,
+        failure_rate=float(setting("FAILURE_RATE", "0.5")),
+        window_size=int(setting("WINDOW_SIZE", "20")),
+        min_calls=int(setting("MIN_CALLS", "5")),
+        cooldown=float(setting("COOLDOWN", "30")),
+    )
+
+
+backend_breaker = _breaker_from_env("backend")
+sentiment_breaker = _breaker_from_env("sentiment")
+circuit_breakers = {
+    breaker.name: breaker for breaker in (backend_breaker, sentiment_breaker)
+}
+
+# Last successful backend GET bodies by URL, served while the backend is down
+_last_good = OrderedDict()
+_last_good_lock = threading.Lock()
+_last_good_max_entries = int(os.getenv("LAST_GOOD_MAX_ENTRIES", "256"))
+
+
+def _remember(request_url, body):
+    with _last_good_lock:
+        _last_good[request_url] = body
+        _last_good.move_to_end(request_url)
+        while len(_last_good) > _last_good_max_entries:
+            _last_good.popitem(last=False)
+
+
+def _recall(request_url):
+    with _last_good_lock:
+        return _last_good.get(request_url)
+
+
+def _send(breaker, method, url, **kwargs):
+    """
+    Makes an HTTP request to an upstream through its circuit breaker.
+
+    Connection errors, timeouts and 5xx responses count as failures; 4xx
+    responses mean the upstream is healthy and count as successes, though
+    they are still raised to the caller.
+
+    Raises:
+        CircuitOpenError: If the circuit is open.
+        requests.exceptions.RequestException: If the request fails.
+    """
+    if not breaker.allow_request():
+        raise CircuitOpenError(f"Circuit for {breaker.name} is open")
+    start = time.perf_counter()
+    try:
+        response = requests.request(
+            method, url, timeout=upstream_timeout, **kwargs
+        )
+        response.raise_for_status()
+    except requests.exceptions.HTTPError as err:
+        if err.response is not None and err.response.status_code < 500:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    finally:
+        _record_timing(breaker.name, time.perf_counter() - start)
+    breaker.record_success()
+    return response
+
+
+def upstream_status():
+    """
+    Returns a snapshot of every upstream circuit breaker.
+
+    Returns:
+        list: One dict per upstream, as returned by
+              ``CircuitBreaker.snapshot``.
+    """
+    return [breaker.snapshot() for breaker in circuit_breakers.values()]
+
+
+def get_request_raw(endpoint, **kwargs):
+    """
+    Performs a GET request to the backend service and returns the raw body.
+
+    This function constructs the request URL, safely joins the base URL with
+    the endpoint, and encodes any provided keyword arguments as query
+    parameters. The response body is returned undecoded so that callers
+    which only relay it to the client can skip parsing it.
 
     Args:
         endpoint (str): The API endpoint to which the request will be sent.
@@ -26,8 +295,10 @@ def get_request(endpoint, **kwargs):
                   parameters.
 
     Returns:
-        dict or None: A dictionary containing the JSON response from the
-                      backend, or None if a network or HTTP error occurs.
+        bytes or None: The JSON response body from the backend. If the call
+                       fails or the backend circuit is open, the last good
+                       body for the same URL is returned instead, or None if
+                       there is none.
     """
     try:
         # Safely join base URL and endpoint
@@ -40,30 +311,48 @@ def get_request(endpoint, **kwargs):
         request_url = f"{base}?{query_string}" if query_string else base
 
         print(f"GET from {request_url}")
-        response = requests.get(request_url)
-        response.raise_for_status()
-        return response.json()
+        response = _send(backend_breaker, "GET", request_url)
+        _remember(request_url, response.content)
+        return response.content
 
     except requests.exceptions.RequestException as err:
         print(f"Network or HTTP exception occurred: {err}")
-        return None
+        # Fall back to the last good copy of this resource, if any
+        cached = _recall(request_url)
+        if cached is not None:
+            print(f"Serving last-known-good response for {request_url}")
+        return cached
 
 
-def analyze_review_sentiments(text):
+def get_request(endpoint, **kwargs):
     """
-    Analyzes the sentiment of a given text by sending it to a dedicated
-    sentiment analyzer microservice.
+    Performs a GET request to the specified endpoint of the backend service.
 
-    This function encodes the text to be URL-safe, constructs the request URL,
-    and sends the text to the sentiment analyzer. It returns the sentiment
-    analysis result as a JSON object.
+    This is a thin wrapper around ``get_request_raw`` that decodes the JSON
+    response body.
 
     Args:
-        text (str): The text whose sentiment is to be analyzed.
+        endpoint (str): The API endpoint to which the request will be sent.
+        **kwargs: Arbitrary keyword arguments that will be sent as query
+                  parameters.
 
     Returns:
-        dict or None: A dictionary containing the sentiment analysis results,
-                      or None if a network or HTTP error occurs.
+        dict or None: A dictionary containing the JSON response from the
+                      backend, or None if a network or HTTP error occurs.
+    """
+    raw = get_request_raw(endpoint, **kwargs)
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError as err:
+        print(f"Invalid JSON from backend: {err}")
+        return None
+
+
+def _analyze_one(text):
+    """
+    Sends a single text to the sentiment analyzer's ``/analyze`` endpoint.
     """
     try:
         encoded_text = quote(text)
@@ -72,8 +361,7 @@ def analyze_review_sentiments(text):
         )
 
         print(f"GET from {request_url}")
-        response = requests.get(request_url)
-        response.raise_for_status()
+        response = _send(sentiment_breaker, "GET", request_url)
         return response.json()
 
     except requests.exceptions.RequestException as err:
@@ -81,6 +369,336 @@ def analyze_review_sentiments(text):
         return None
 
 
+class Histogram:
+    """
+    A thread-safe histogram over fixed, ascending bucket upper bounds.
+
+    Observations above the last bound are counted in an overflow bucket.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self):
+        """
+        Returns the bucket counts, total count and mean as a dict.
+        """
+        with self._lock:
+            labels = [f"<={bound}" for bound in self.bounds]
+            labels.append(f">{self.bounds[-1]}")
+            return {
+                "buckets": dict(zip(labels, self._counts, strict=True)),
+                "count": self._count,
+                "mean": round(self._sum / self._count, 3)
+                if self._count
+                else 0.0,
+            }
+
+
+class SentimentBatcher:
+    """
+    Coalesces sentiment requests from concurrent threads into batches.
+
+    Callers submit texts and receive futures. A collector thread waits up to
+    ``window`` seconds after the first queued text (or until ``max_size``
+    texts are queued), then sends the whole batch to the analyzer's
+    ``/analyze_batch`` endpoint and resolves each future with its result, or
+    None on failure. If the analyzer has no batch endpoint the batch is
+    analyzed text by text instead.
+
+    Batches are sent on the batcher's own pool of ``dispatch_workers``
+    threads rather than ``upstream_executor``, so slow backend calls cannot
+    hold them past the window. ``results`` waits up to ``queue_timeout`` for
+    a text to be dispatched; a text still queued by then is cancelled and
+    dropped before it reaches the analyzer. A dispatched text gets another
+    ``batch_timeout`` for its batch to complete. Either way the caller gets
+    None for a text not analyzed in time.
+
+    Callers with more than ``max_size`` texts should use ``analyze_bulk``,
+    which sends them in chunks on the calling thread instead of flooding the
+    shared queue ahead of everyone else's texts.
+
+    Batch sizes and per-text queueing delays (in milliseconds) are recorded
+    in histograms, reported by ``snapshot``.
+
+    Args:
+        window (float): Seconds to wait for more texts after the first.
+        max_size (int): Maximum texts per batch.
+        dispatch_workers (int): Batches that may be in flight at once.
+    """
+
+    def __init__(self, window=0.005, max_size=32, dispatch_workers=4):
+        self.window = window
+        self.max_size = max_size
+        self.dispatch_workers = dispatch_workers
+        self.queue_timeout = window + upstream_timeout
+        self.batch_timeout = upstream_timeout + 1.0
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.queue_delays_ms = Histogram([0.5, 1, 2, 5, 10, 20, 50, 100])
+        self._queue = SimpleQueue()
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_collector(self):
+        # Threads do not survive a fork, so each worker process starts its
+        # own collector and dispatch pool on first use.
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = SimpleQueue()
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.dispatch_workers,
+                        thread_name_prefix="sentiment-dispatch",
+                    )
+                    threading.Thread(
+                        target=self._collect,
+                        args=(self._queue,),
+                        name="sentiment-batcher",
+                        daemon=True,
+                    ).start()
+                    self._pid = os.getpid()
+
+    def submit(self, text):
+        """
+        Queues a text for analysis.
+
+        Args:
+            text (str): The text whose sentiment is to be analyzed.
+
+        Returns:
+            Future: Resolves to the analyzer's result dict, or None.
+        """
+        self._ensure_collector()
+        future = Future()
+        # Set by the dispatcher when the text's batch starts, so callers
+        # can time the queue and the batch separately
+        future.dispatched_at = None
+        future.dispatched = threading.Event()
+        self._queue.put((text, future, time.monotonic()))
+        return future
+
+    def results(self, futures):
+        """
+        Waits for submitted texts' results.
+
+        Args:
+            futures (list): Futures returned by ``submit``.
+
+        Returns:
+            list: One result per future, in order, with None for any text
+                  not dispatched within ``queue_timeout`` or not analyzed
+                  within ``batch_timeout`` of being dispatched.
+        """
+        start = time.perf_counter()
+        queue_deadline = time.monotonic() + self.queue_timeout
+        results = [self._wait(future, queue_deadline) for future in futures]
+        # The analyzer is called from the dispatch pool, which cannot tell
+        # whose texts it is sending, so time the wait here instead
+        _record_timing("sentiment_batch", time.perf_counter() - start)
+        return results
+
+    def _wait(self, future, queue_deadline):
+        remaining = queue_deadline - time.monotonic()
+        if not future.dispatched.wait(timeout=max(0, remaining)):
+            if future.cancel():
+                # Still queued: the dispatcher will skip it
+                print("Sentiment analysis timed out in the queue")
+                return None
+            # Dispatched just now, or resolved by the collector
+            future.dispatched.wait(timeout=0.1)
+        if future.dispatched_at is None:
+            batch_deadline = time.monotonic() + self.batch_timeout
+        else:
+            batch_deadline = future.dispatched_at + self.batch_timeout
+        try:
+            return future.result(
+                timeout=max(0, batch_deadline - time.monotonic())
+            )
+        except TimeoutError:
+            print("Sentiment analysis timed out")
+            return None
+
+    def analyze_bulk(self, texts):
+        """
+        Analyzes many texts in ``max_size`` batches on the calling thread.
+
+        Args:
+            texts (list): The texts whose sentiment is to be analyzed.
+
+        Returns:
+            list: One result per text, in order, None where it failed.
+        """
+        results = []
+        for start in range(0, len(texts), self.max_size):
+            batch = texts[start : start + self.max_size]
+            self.batch_sizes.observe(len(batch))
+            results.extend(self._send_batch(batch))
+        return results
+
+    def _collect(self, queue):
+        while True:
+            batch = []
+            try:
+                batch.append(queue.get())
+                deadline = batch[0][2] + self.window
+                while len(batch) < self.max_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(queue.get(timeout=timeout))
+                    except Empty:
+                        break
+
+                now = time.monotonic()
+                self.batch_sizes.observe(len(batch))
+                for _, _, enqueued in batch:
+                    self.queue_delays_ms.observe((now - enqueued) * 1000)
+                self._executor.submit(self._dispatch, batch)
+            except Exception as err:
+                # Keep collecting; this batch's callers get None
+                print(f"Sentiment batcher error: {err}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_result(None)
+                    future.dispatched.set()
+
+    def _dispatch(self, batch):
+        # Drop texts whose callers gave up while they were queued
+        batch = [
+            item for item in batch if item[1].set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+        dispatched_at = time.monotonic()
+        for _, future, _ in batch:
+            future.dispatched_at = dispatched_at
+            future.dispatched.set()
+        texts = [text for text, _, _ in batch]
+        try:
+            results = self._send_batch(texts)
+        except Exception as err:
+            print(f"Sentiment batch failed: {err}")
+            results = [None] * len(batch)
+        for (_, future, _), result in zip(batch, results, strict=True):
+            future.set_result(result)
+
+    def _send_batch(self, texts):
+        request_url = urljoin(sentiment_analyzer_url, "/analyze_batch")
+        try:
+            print(f"POST to {request_url} with {len(texts)} texts")
+            response = _send(
+                sentiment_breaker, "POST", request_url, json={"texts": texts}
+            )
+            results = response.json()["results"]
+            if len(results) != len(texts):
+                raise ValueError("Batch result count mismatch")
+            return results
+        except requests.exceptions.HTTPError as err:
+            if err.response is not None and err.response.status_code == 404:
+                # The analyzer predates /analyze_batch
+                return [_analyze_one(text) for text in texts]
+            print(f"Network or HTTP exception occurred: {err}")
+            return [None] * len(texts)
+        except requests.exceptions.RequestException as err:
+            print(f"Network or HTTP exception occurred: {err}")
+            return [None] * len(texts)
+
+    def snapshot(self):
+        """
+        Returns the batching configuration and histograms as a dict.
+        """
+        return {
+            "window_ms": self.window * 1000,
+            "max_size": self.max_size,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_delay_ms": self.queue_delays_ms.snapshot(),
+        }
+
+
+# Set SENTIMENT_BATCHING=0 to call the analyzer once per text instead
+sentiment_batcher = None
+if os.getenv("SENTIMENT_BATCHING", "1") == "1":
+    sentiment_batcher = SentimentBatcher(
+        window=float(os.getenv("SENTIMENT_BATCH_WINDOW_MS", "5")) / 1000,
+        max_size=int(os.getenv("SENTIMENT_BATCH_MAX_SIZE", "32")),
+        dispatch_workers=int(os.getenv("SENTIMENT_DISPATCH_WORKERS", "4")),
+    )
+
+
+def sentiment_batching_status():
+    """
+    Returns the sentiment batcher's histograms, or None if it is disabled.
+    """
+    if sentiment_batcher is None:
+        return None
+    return sentiment_batcher.snapshot()
+
+
+def analyze_review_sentiments(text):
+    """
+    Analyzes the sentiment of a given text by sending it to a dedicated
+    sentiment analyzer microservice.
+
+    When batching is enabled the text is coalesced with concurrent requests
+    from other threads into a single call to the analyzer; otherwise it is
+    sent on its own. Either way the call blocks until the result is ready,
+    or until the batcher gives up on it.
+
+    Args:
+        text (str): The text whose sentiment is to be analyzed.
+
+    Returns:
+        dict or None: A dictionary containing the sentiment analysis results,
+                      or None if a network or HTTP error occurs or the
+                      sentiment circuit is open.
+    """
+    if sentiment_batcher is not None:
+        return sentiment_batcher.results([sentiment_batcher.submit(text)])[0]
+    return _analyze_one(text)
+
+
+def analyze_many_review_sentiments(texts):
+    """
+    Analyzes the sentiment of several texts concurrently.
+
+    With batching enabled up to ``max_size`` texts are queued at once, so
+    they usually travel to the analyzer in a single batch; more than that
+    are sent in chunks by ``SentimentBatcher.analyze_bulk``. Without
+    batching each text is sent on the shared upstream thread pool.
+
+    Args:
+        texts (iterable): The texts whose sentiment is to be analyzed.
+
+    Returns:
+        list: One result per text, in order, each as returned by
+              ``analyze_review_sentiments`` (None on error).
+    """
+    if sentiment_batcher is not None:
+        texts = list(texts)
+        if len(texts) > sentiment_batcher.max_size:
+            return sentiment_batcher.analyze_bulk(texts)
+        futures = [sentiment_batcher.submit(text) for text in texts]
+        return sentiment_batcher.results(futures)
+    return list(upstream_executor.map(_analyze_one, texts))
+
+
 def post_review(data_dict):
     """
     Posts a new review to the backend service.
@@ -93,14 +711,14 @@ def post_review(data_dict):
 
     Returns:
         dict or None: A dictionary containing the JSON response from the
-                      backend, or None if a network or HTTP error occurs.
+                      backend, or None if a network or HTTP error occurs or
+                      the backend circuit is open.
     """
     try:
         request_url = urljoin(backend_url, "/insert_review/")
         print(f"POST to {request_url} with data: {data_dict}")
 
-        response = requests.post(request_url, json=data_dict)
-        response.raise_for_status()
+        response = _send(backend_breaker, "POST", request_url, json=data_dict)
         return response.json()
 
     except requests.exceptions.RequestException as err:
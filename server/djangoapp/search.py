@@ -0,0 +1,399 @@
+"""
+In-process full-text search over dealer reviews.
+
+This module keeps an inverted index over review text plus facet indexes on
+``dealership``, ``car_make``, ``car_model`` and ``car_year``. The index is
+built from the backend's ``/fetchReviews`` data on first use, is updated
+incrementally when a review is posted, and ranks matches with BM25, so a
+search touches only the postings of its terms instead of every review.
+Searches can also be restricted to a ``state``, using a dealer-to-state map
+loaded alongside the reviews.
+
+Each worker process holds its own index. Reviews posted through another
+worker are picked up by pulling ``/fetchReviews?since_id=`` at most every
+``REVIEW_INDEX_REFRESH_SECONDS``, and the dealer map is reloaded with them.
+"""
+
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+
+from django.conf import settings
+
+from .replica import get_replica_dealers, replica_enabled
+from .restapis import get_request
+
+logger = logging.getLogger(__name__)
+
+FACET_FIELDS = ("dealership", "car_make", "car_model", "car_year")
+# Filters accepted by ReviewIndex.search; "state" matches reviews of any
+# dealership in that state
+FILTER_FIELDS = FACET_FIELDS + ("state",)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text):
+    """
+    Splits text into lowercase alphanumeric terms.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list: The terms in order of appearance.
+    """
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def _facet_value(value):
+    """
+    Normalizes a facet value so lookups are case-insensitive.
+    """
+    return str(value).strip().lower()
+
+
+class ReviewIndex:
+    """
+    An inverted index with facets over review documents.
+
+    All public methods are thread-safe. Reviews are keyed by their ``id``;
+    adding a review whose ``id`` is already indexed replaces it.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.built = False
+        # Highest review id pulled from the backend. Reviews added locally
+        # through add() do not move it, so a refresh never skips reviews
+        # posted elsewhere with a lower id.
+        self.synced_id = 0
+        self.refreshed_at = 0.0
+        # State -> dealership facet values; kept across builds
+        self._state_dealers = {}
+        self._reset()
+
+    def _reset(self):
+        self._docs = {}  # review id -> review dict
+        self._lengths = {}  # review id -> number of terms
+        self._total_length = 0
+        self._postings = {}  # term -> {review id: term frequency}
+        self._facets = {field: {} for field in FACET_FIELDS}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def build(self, reviews):
+        """
+        Replaces the index contents with the given reviews.
+
+        Args:
+            reviews (iterable): Review dicts as returned by the backend.
+        """
+        with self._lock:
+            self._reset()
+            self.synced_id = 0
+            self._merge(reviews)
+            self.built = True
+
+    def refresh(self, reviews):
+        """
+        Adds reviews pulled from the backend since the last build or refresh.
+
+        Args:
+            reviews (iterable): Review dicts newer than ``synced_id``.
+
+        Returns:
+            int: The number of reviews added or replaced.
+        """
+        with self._lock:
+            return self._merge(reviews)
+
+    def _merge(self, reviews):
+        count = 0
+        for review in reviews:
+            self._add(review)
+            review_id = review.get("id")
+            if isinstance(review_id, int) and review_id > self.synced_id:
+                self.synced_id = review_id
+            count += 1
+        self.refreshed_at = time.monotonic()
+        return count
+
+    def set_dealers(self, dealers):
+        """
+        Replaces the dealer-to-state map used by the ``state`` filter.
+
+        Args:
+            dealers (iterable): Dealer dicts with ``id`` and ``state``.
+        """
+        state_dealers = {}
+        for dealer in dealers:
+            state = dealer.get("state")
+            if state:
+                state_dealers.setdefault(_facet_value(state), set()).add(
+                    _facet_value(dealer["id"])
+                )
+        with self._lock:
+            self._state_dealers = state_dealers
+
+    def add(self, review):
+        """
+        Adds or replaces a single review.
+
+        Args:
+            review (dict): A review dict with at least ``id`` and ``review``.
+        """
+        with self._lock:
+            self._add(review)
+
+    def _add(self, review):
+        review_id = review.get("id")
+        if review_id is None:
+            return
+        if review_id in self._docs:
+            self._remove(review_id)
+
+        terms = tokenize(review.get("review"))
+        frequencies = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, count in frequencies.items():
+            self._postings.setdefault(term, {})[review_id] = count
+
+        for field in FACET_FIELDS:
+            value = review.get(field)
+            if value is not None:
+                self._facets[field].setdefault(_facet_value(value), set()).add(
+                    review_id
+                )
+
+        self._docs[review_id] = review
+        self._lengths[review_id] = len(terms)
+        self._total_length += len(terms)
+
+    def _remove(self, review_id):
+        review = self._docs.pop(review_id)
+        for term in set(tokenize(review.get("review"))):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(review_id, None)
+                if not postings:
+                    del self._postings[term]
+        for field in FACET_FIELDS:
+            value = review.get(field)
+            if value is not None:
+                self._facets[field].get(_facet_value(value), set()).discard(
+                    review_id
+                )
+        self._total_length -= self._lengths.pop(review_id)
+
+    def _candidates(self, filters):
+        """
+        Returns the ids matching every facet filter, or None for no filters.
+
+        A filter value may be a single value or a collection of values, in
+        which case any of them matches. ``state`` values are expanded to the
+        dealerships in those states.
+        """
+        candidates = None
+        for field, wanted in filters.items():
+            if wanted is None:
+                continue
+            if isinstance(wanted, (list, tuple, set, frozenset)):
+                values = wanted
+            else:
+                values = [wanted]
+            if field == "state":
+                field = "dealership"
+                values = set().union(
+                    *(
+                        self._state_dealers.get(_facet_value(value), ())
+                        for value in values
+                    )
+                )
+            index = self._facets[field]
+            matched = set()
+            for value in values:
+                matched |= index.get(_facet_value(value), set())
+            if candidates is None:
+                candidates = matched
+            else:
+                candidates &= matched
+            if not candidates:
+                return set()
+        return candidates
+
+    def search(self, query="", filters=None, page=1, page_size=20):
+        """
+        Runs a ranked search over the indexed reviews.
+
+        Reviews matching any query term are ranked by BM25. Without a query,
+        every review passing the filters matches, newest first.
+
+        Args:
+            query (str, optional): Free text to match against review text.
+            filters (dict, optional): Facet filters keyed by a name from
+                                      ``FILTER_FIELDS``.
+            page (int, optional): The 1-based page number. Defaults to 1.
+            page_size (int, optional): Results per page. Defaults to 20.
+
+        Returns:
+            tuple: ``(total, results)`` where ``total`` is the number of
+                   matching reviews and ``results`` is the requested page as
+                   a list of review dicts with an added ``score``.
+        """
+        filters = filters or {}
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown facet(s): {', '.join(sorted(unknown))}")
+        terms = set(tokenize(query))
+        limit = page * page_size
+
+        with self._lock:
+            candidates = self._candidates(filters)
+
+            if not terms:
+                ids = self._docs if candidates is None else candidates
+                total = len(ids)
+                top = heapq.nlargest(limit, ids)
+                ranked = [(0.0, review_id) for review_id in top]
+            else:
+                scores = self._score(terms, candidates)
+                total = len(scores)
+                ranked = heapq.nlargest(
+                    limit, ((s, i) for i, s in scores.items())
+                )
+
+            results = [
+                dict(self._docs[review_id], score=round(score, 4))
+                for score, review_id in ranked[limit - page_size :]
+            ]
+        return total, results
+
+    def _score(self, terms, candidates):
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count if doc_count else 0
+        scores = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for review_id, frequency in postings.items():
+                if candidates is not None and review_id not in candidates:
+                    continue
+                norm = _K1 * (
+                    1 - _B + _B * self._lengths[review_id] / average_length
+                )
+                scores[review_id] = scores.get(review_id, 0.0) + idf * (
+                    frequency * (_K1 + 1) / (frequency + norm)
+                )
+        return scores
+
+
+review_index = ReviewIndex()
+_build_lock = threading.Lock()
+
+
+def _load_dealers():
+    """
+    Returns all dealers from the replica if enabled, else from the backend.
+    """
+    if replica_enabled():
+        dealers = get_replica_dealers()
+        if dealers:
+            return dealers
+    return get_request("/fetchDealers")
+
+
+def _refresh_due():
+    interval = getattr(settings, "REVIEW_INDEX_REFRESH_SECONDS", 30)
+    return time.monotonic() - review_index.refreshed_at >= interval
+
+
+def _refresh_review_index():
+    """
+    Pulls reviews newer than the index's watermark from the backend.
+
+    Only one thread refreshes at a time; the others keep searching the
+    current index instead of waiting. A failed pull is logged and retried
+    after the next interval.
+    """
+    if not _build_lock.acquire(blocking=False):
+        return
+    try:
+        if not _refresh_due():
+            return
+        since_id = review_index.synced_id
+        reviews = get_request("/fetchReviews", since_id=since_id)
+        if reviews is None:
+            logger.warning("Could not refresh the review index")
+            review_index.refreshed_at = time.monotonic()
+            return
+        # Older backends ignore since_id and return everything
+        added = review_index.refresh(
+            review for review in reviews if review.get("id", 0) > since_id
+        )
+        if added:
+            logger.info("Added %d reviews to the index", added)
+        dealers = _load_dealers()
+        if dealers is None:
+            logger.warning("Could not refresh the index's dealer states")
+        else:
+            review_index.set_dealers(dealers)
+    finally:
+        _build_lock.release()
+
+
+def get_review_index():
+    """
+    Returns the process-wide review index, building it on first use.
+
+    The index is loaded from the backend's ``/fetchReviews`` endpoint, and
+    its dealer states from the replica or ``/fetchDealers``. If the backend
+    is unreachable the index stays unbuilt and the next call retries. Once
+    built, it is brought up to date with reviews posted through other
+    workers every ``REVIEW_INDEX_REFRESH_SECONDS``.
+
+    Returns:
+        ReviewIndex or None: The built index, or None if it could not be
+                             loaded.
+    """
+    if not review_index.built:
+        with _build_lock:
+            if not review_index.built:
+                reviews = get_request("/fetchReviews")
+                dealers = _load_dealers()
+                if reviews is None or dealers is None:
+                    logger.error("Could not load reviews for the index")
+                    return None
+                review_index.set_dealers(dealers)
+                review_index.build(reviews)
+                logger.info("Indexed %d reviews", len(review_index))
+    elif _refresh_due():
+        _refresh_review_index()
+    return review_index
+
+
+def index_review(review):
+    """
+    Adds a newly posted review to the index if it has been built.
+
+    An unbuilt index is left alone; it will pick the review up from the
+    backend when it is first built.
+
+    Args:
+        review (dict or None): The review as saved by the backend.
+    """
+    if review_index.built and isinstance(review, dict):
+        review_index.add(review)
@@ -0,0 +1,189 @@
+"""
+Per-dealer review sentiment counters.
+
+The counters live in the ``DealerSentiment`` model. They are updated one
+review at a time when ``add_review`` posts a review, and can be rebuilt in
+bulk from the backend with ``manage.py rebuild_sentiment``.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .models import DealerSentiment
+from .restapis import (
+    analyze_many_review_sentiments,
+    analyze_review_sentiments,
+    get_request,
+)
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_LABELS = ("positive", "neutral", "negative")
+
+
+def _label(result):
+    """
+    Returns an analyzer result's label, treating unknown labels as neutral.
+    """
+    label = result.get("sentiment")
+    return label if label in SENTIMENT_LABELS else "neutral"
+
+
+def _apply(summary, result):
+    """
+    Adds one analyzer result to a summary's counters.
+    """
+    label = _label(result)
+    setattr(summary, label, getattr(summary, label) + 1)
+    summary.compound_total += float(result.get("compound") or 0.0)
+    summary.recalculate()
+
+
+def _dealer_state(dealer_id):
+    """
+    Looks up a dealer's state from the backend, or "" if unavailable.
+    """
+    dealers = get_request("/fetchDealer/" + str(dealer_id))
+    if dealers:
+        return dealers[0].get("state", "")
+    return ""
+
+
+def record_review_sentiment(review):
+    """
+    Scores a newly posted review and adds it to its dealer's counters.
+
+    Counters are incremented in the database, so concurrent reviews for the
+    same dealer are all counted. Analyzer failures are logged rather than
+    raised; the counters can always be rebuilt with
+    ``manage.py rebuild_sentiment``.
+
+    Args:
+        review (dict or None): The review as saved by the backend.
+
+    Returns:
+        DealerSentiment or None: The updated summary, or None if the review
+                                 could not be scored.
+    """
+    if not isinstance(review, dict) or review.get("dealership") is None:
+        return None
+    result = analyze_review_sentiments(review.get("review", ""))
+    if result is None:
+        logger.warning(
+            "Could not score review %s; sentiment counters are stale",
+            review.get("id"),
+        )
+        return None
+
+    dealer_id = int(review["dealership"])
+    label = _label(result)
+    summary, _ = DealerSentiment.objects.get_or_create(
+        dealer_id=dealer_id,
+        defaults={"state": lambda: _dealer_state(dealer_id)},
+    )
+    # Increment in a single UPDATE so concurrent reviews for the same dealer
+    # cannot overwrite each other. Every right-hand side sees the row as it
+    # was before the update, hence the explicit +1s in the ratio.
+    positive = F("positive") + (1 if label == "positive" else 0)
+    total = F("positive") + F("neutral") + F("negative") + 1
+    DealerSentiment.objects.filter(pk=summary.pk).update(
+        **{label: F(label) + 1},
+        compound_total=F("compound_total")
+        + float(result.get("compound") or 0.0),
+        positive_ratio=Cast(positive, FloatField()) / total,
+        updated_at=timezone.now(),
+    )
+    summary.refresh_from_db()
+    return summary
+
+
+def rebuild_sentiment_summaries(reviews, dealers, allow_partial=False):
+    """
+    Recomputes every dealer's counters from scratch.
+
+    If the analyzer could not score every review the existing rows are left
+    untouched, since replacing them would silently undercount those
+    dealers, unless ``allow_partial`` is set.
+
+    Args:
+        reviews (list): All reviews, as returned by ``/fetchReviews``.
+        dealers (list): All dealers, as returned by ``/fetchDealers``.
+        allow_partial (bool, optional): Write the counters even if some
+                                        reviews were skipped. Defaults to
+                                        False.
+
+    Returns:
+        tuple: ``(summaries, skipped)`` where ``summaries`` is the number of
+               dealer rows written, or None if nothing was written, and
+               ``skipped`` the number of reviews the analyzer could not
+               score.
+    """
+    states = {dealer["id"]: dealer.get("state", "") for dealer in dealers}
+    summaries = {}
+    skipped = 0
+    results = analyze_many_review_sentiments(
+        review.get("review", "") for review in reviews
+    )
+    for review, result in zip(reviews, results, strict=True):
+        if result is None:
+            skipped += 1
+            continue
+        dealer_id = int(review["dealership"])
+        summary = summaries.get(dealer_id)
+        if summary is None:
+            summary = summaries[dealer_id] = DealerSentiment(
+                dealer_id=dealer_id, state=states.get(dealer_id, "")
+            )
+        _apply(summary, result)
+
+    if skipped and not allow_partial:
+        logger.warning(
+            "Sentiment rebuild left unchanged: %d of %d reviews not scored",
+            skipped,
+            len(reviews),
+        )
+        return None, skipped
+
+    with transaction.atomic():
+        DealerSentiment.objects.all().delete()
+        DealerSentiment.objects.bulk_create(summaries.values())
+    return len(summaries), skipped
+
+
+def get_sentiment_summary(dealer_id):
+    """
+    Returns a dealer's counters as a dict (all zero if it has no reviews).
+    """
+    summary = DealerSentiment.objects.filter(dealer_id=dealer_id).first()
+    if summary is None:
+        summary = DealerSentiment(dealer_id=dealer_id)
+    return summary.as_dict()
+
+
+def get_leaderboard(state=None, limit=10, min_reviews=1):
+    """
+    Returns the dealers with the highest share of positive reviews.
+
+    The query is served from the ``(state, positive_ratio)`` index, so it
+    reads only the top rows instead of scanning every dealer.
+
+    Args:
+        state (str, optional): Restrict the board to this state.
+        limit (int, optional): Maximum number of dealers. Defaults to 10.
+        min_reviews (int, optional): Skip dealers with fewer reviews than
+                                     this. Defaults to 1.
+
+    Returns:
+        list: Summary dicts ordered by descending positive ratio.
+    """
+    summaries = DealerSentiment.objects.annotate(
+        review_count=F("positive") + F("neutral") + F("negative")
+    ).filter(review_count__gte=min_reviews)
+    if state:
+        summaries = summaries.filter(state=state)
+    summaries = summaries.order_by("-positive_ratio", "dealer_id")[:limit]
+    return [summary.as_dict() for summary in summaries]
@@ -0,0 +1,5 @@
+"""
+Tests for djangoapp.
+
+Run with ``python manage.py test djangoapp``.
+"""
@@ -0,0 +1,21 @@
+"""
+Shared helpers for the djangoapp tests.
+"""
+
+
+class FakeClock:
+    """
+    Stands in for the ``time`` module with a manually advanced clock.
+    """
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
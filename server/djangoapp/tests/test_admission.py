@@ -0,0 +1,196 @@
+"""
+Tests for the token-bucket stores and AdmissionControlMiddleware.
+"""
+
+import tempfile
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..middleware import AdmissionControlMiddleware
+from ..ratelimit import LocalMemoryStore
+from ..responses import JsonResponse
+from .helpers import FakeClock
+
+
+class LocalMemoryStoreTests(SimpleTestCase):
+    """
+    Tests token-bucket refill and concurrency slots of LocalMemoryStore.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("djangoapp.ratelimit.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        slot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(slot_dir.cleanup)
+        self.store = LocalMemoryStore(slot_dir=slot_dir.name)
+
+    def test_bucket_starts_full_and_empties(self):
+        for _ in range(3):
+            self.assertEqual(self.store.consume("k", 1.0, 3), (True, 0.0))
+        allowed, retry_after = self.store.consume("k", 1.0, 3)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 1.0)
+
+    def test_bucket_refills_at_rate(self):
+        for _ in range(2):
+            self.store.consume("k", 2.0, 2)
+        self.clock.advance(0.25)
+        allowed, retry_after = self.store.consume("k", 2.0, 2)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 0.25)
+        self.clock.advance(0.25)
+        self.assertTrue(self.store.consume("k", 2.0, 2)[0])
+
+    def test_bucket_refill_is_capped_at_burst(self):
+        self.store.consume("k", 1.0, 2)
+        self.clock.advance(100)
+        results = [self.store.consume("k", 1.0, 2)[0] for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+
+    def test_buckets_are_independent_per_key(self):
+        self.store.consume("a", 1.0, 1)
+        self.assertFalse(self.store.consume("a", 1.0, 1)[0])
+        self.assertTrue(self.store.consume("b", 1.0, 1)[0])
+
+    def test_slots_are_limited_and_released(self):
+        first = self.store.acquire("upstream", 2)
+        second = self.store.acquire("upstream", 2)
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertIsNone(self.store.acquire("upstream", 2))
+        self.store.release(first)
+        third = self.store.acquire("upstream", 2)
+        self.assertIsNotNone(third)
+        self.store.release(second)
+        self.store.release(third)
+
+
+def get_dealer_reviews(request):
+    return JsonResponse({"status": 200})
+
+
+class AdmissionControlMiddlewareTests(SimpleTestCase):
+    """
+    Tests the 429 and 503 responses of AdmissionControlMiddleware.
+    """
+
+    def setUp(self):
+        slot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(slot_dir.cleanup)
+        with override_settings(
+            RATE_LIMITS={"get_dealer_reviews": {"rate": 0.5, "burst": 1}},
+            UPSTREAM_HEAVY_VIEWS=["get_dealer_reviews"],
+            UPSTREAM_CONCURRENCY_LIMIT=1,
+            RATE_LIMIT_STORE="djangoapp.ratelimit.LocalMemoryStore",
+            RATE_LIMIT_SLOT_DIR=slot_dir.name,
+        ):
+            self.middleware = AdmissionControlMiddleware(get_dealer_reviews)
+        self.factory = RequestFactory()
+
+    def admit(self, request):
+        return self.middleware.process_view(
+            request, get_dealer_reviews, (), {}
+        )
+
+    def finish(self, request):
+        self.middleware.store.release(request._admission_slot)
+        request._admission_slot = None
+
+    def test_rate_limited_request_gets_429_with_retry_after(self):
+        first = self.factory.get("/")
+        self.assertIsNone(self.admit(first))
+        self.finish(first)
+        response = self.admit(self.factory.get("/"))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "2")
+
+    def test_shed_request_gets_503_without_spending_a_token(self):
+        holder = self.factory.get("/", REMOTE_ADDR="10.0.0.1")
+        self.assertIsNone(self.admit(holder))
+        other = self.factory.get("/", REMOTE_ADDR="10.0.0.2")
+        response = self.admit(other)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.finish(holder)
+        self.assertIsNone(self.admit(other))
+        self.finish(other)
+
+    def test_rate_limited_request_releases_its_slot(self):
+        first = self.factory.get("/")
+        self.admit(first)
+        self.finish(first)
+        self.assertEqual(self.admit(self.factory.get("/")).status_code, 429)
+        other = self.factory.get("/", REMOTE_ADDR="10.0.0.2")
+        self.assertIsNone(self.admit(other))
+        self.finish(other)
+
+
+class ClientAddressTests(SimpleTestCase):
+    """
+    Tests how AdmissionControlMiddleware identifies anonymous clients.
+    """
+
+    def middleware(self, **overrides):
+        with override_settings(**overrides):
+            return AdmissionControlMiddleware(get_dealer_reviews)
+
+    def request(self, **headers):
+        return RequestFactory().get("/", REMOTE_ADDR="10.0.0.9", **headers)
+
+    def test_remote_addr_without_trusted_proxies(self):
+        middleware = self.middleware(RATE_LIMIT_TRUSTED_PROXIES=0)
+        request = self.request(HTTP_X_FORWARDED_FOR="1.1.1.1")
+        self.assertEqual(middleware.client_address(request), "10.0.0.9")
+
+    def test_remote_addr_when_no_forwarded_header(self):
+        middleware = self.middleware(RATE_LIMIT_TRUSTED_PROXIES=1)
+        self.assertEqual(middleware.client_address(self.request()), "10.0.0.9")
+
+    def test_right_most_entry_behind_one_proxy(self):
+        middleware = self.middleware(RATE_LIMIT_TRUSTED_PROXIES=1)
+        request = self.request(HTTP_X_FORWARDED_FOR="6.6.6.6, 203.0.113.7")
+        self.assertEqual(middleware.client_address(request), "203.0.113.7")
+
+    def test_spoofed_entries_do_not_change_the_bucket(self):
+        middleware = self.middleware(RATE_LIMIT_TRUSTED_PROXIES=1)
+        keys = {
+            middleware.client_key(
+                self.request(HTTP_X_FORWARDED_FOR=f"{spoof}, 203.0.113.7")
+            )
+            for spoof in ("1.1.1.1", "2.2.2.2", "3.3.3.3")
+        }
+        self.assertEqual(keys, {"ip:203.0.113.7"})
+
+    def test_trusted_hop_count(self):
+        middleware = self.middleware(RATE_LIMIT_TRUSTED_PROXIES=2)
+        request = self.request(
+            HTTP_X_FORWARDED_FOR="6.6.6.6, 203.0.113.7, 10.0.0.2"
+        )
+        self.assertEqual(middleware.client_address(request), "203.0.113.7")
+
+    def test_fewer_entries_than_trusted_proxies(self):
+        middleware = self.middleware(RATE_LIMIT_TRUSTED_PROXIES=3)
+        request = self.request(HTTP_X_FORWARDED_FOR="203.0.113.7, 10.0.0.2")
+        self.assertEqual(middleware.client_address(request), "203.0.113.7")
+
+    def test_client_ip_header_takes_precedence(self):
+        middleware = self.middleware(
+            RATE_LIMIT_TRUSTED_PROXIES=1,
+            RATE_LIMIT_CLIENT_IP_HEADER="X-Real-IP",
+        )
+        request = self.request(
+            HTTP_X_REAL_IP="203.0.113.8",
+            HTTP_X_FORWARDED_FOR="203.0.113.7",
+        )
+        self.assertEqual(middleware.client_address(request), "203.0.113.8")
+
+    def test_missing_client_ip_header_falls_back(self):
+        middleware = self.middleware(
+            RATE_LIMIT_TRUSTED_PROXIES=1,
+            RATE_LIMIT_CLIENT_IP_HEADER="X-Real-IP",
+        )
+        request = self.request(HTTP_X_FORWARDED_FOR="203.0.113.7")
+        self.assertEqual(middleware.client_address(request), "203.0.113.7")
@@ -0,0 +1,74 @@
+"""
+Tests for the upstream circuit breaker in djangoapp.restapis.
+"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..restapis import CircuitBreaker
+from .helpers import FakeClock
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """
+    Tests the closed, open and half-open transitions of CircuitBreaker.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("djangoapp.restapis.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(
+            "test", failure_rate=0.5, window_size=4, min_calls=4, cooldown=10
+        )
+
+    def trip(self):
+        for _ in range(4):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+
+    def test_stays_closed_below_min_calls(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_stays_closed_below_failure_rate(self):
+        self.breaker.record_failure()
+        for _ in range(3):
+            self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_opens_and_rejects_when_failure_rate_is_reached(self):
+        self.trip()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.snapshot()["rejected"], 1)
+
+    def test_half_open_after_cooldown_allows_a_single_trial(self):
+        self.trip()
+        self.clock.advance(10)
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_successful_trial_closes_the_circuit(self):
+        self.trip()
+        self.clock.advance(10)
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.snapshot()["calls"], 0)
+
+    def test_failed_trial_reopens_for_another_cooldown(self):
+        self.trip()
+        self.clock.advance(10)
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.clock.advance(9)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.clock.advance(1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
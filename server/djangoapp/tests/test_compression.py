@@ -0,0 +1,81 @@
+"""
+Tests for CompressionMiddleware in djangoapp.middleware.
+"""
+
+import gzip
+import json
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..middleware import CompressionMiddleware, brotli
+from ..responses import JsonResponse
+
+LARGE = {"reviews": [{"id": i, "review": "Great service"} for i in range(100)]}
+
+
+def respond_with(response):
+    return CompressionMiddleware(lambda request: response)
+
+
+@override_settings(COMPRESSION_MIN_SIZE=256)
+class CompressionMiddlewareTests(SimpleTestCase):
+    """
+    Tests when responses are compressed and how their headers change.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get(self, response, accept="gzip"):
+        request = self.factory.get("/", headers={"accept-encoding": accept})
+        return respond_with(response)(request)
+
+    def test_large_json_is_gzipped(self):
+        response = self.get(JsonResponse(LARGE))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            response["Content-Length"], str(len(response.content))
+        )
+        self.assertEqual(json.loads(gzip.decompress(response.content)), LARGE)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_brotli_is_preferred_when_installed(self):
+        if brotli is None:
+            self.skipTest("brotli is not installed")
+        response = self.get(JsonResponse(LARGE), accept="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(
+            json.loads(brotli.decompress(response.content)), LARGE
+        )
+
+    def test_bodies_below_the_threshold_are_left_alone(self):
+        small = {"status": 200}
+        response = self.get(JsonResponse(small))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(json.loads(response.content), small)
+        # Still varies: a larger body from the same URL would be compressed
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_existing_content_encoding_is_left_alone(self):
+        body = gzip.compress(json.dumps(LARGE).encode())
+        original = HttpResponse(body, content_type="application/json")
+        original["Content-Encoding"] = "gzip"
+        response = self.get(original, accept="br, gzip")
+        self.assertEqual(response.content, body)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_other_content_types_are_left_alone(self):
+        html = HttpResponse("<p>hello</p>" * 100, content_type="text/html")
+        response = self.get(html)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_clients_without_a_supported_coding_get_identity(self):
+        response = self.get(JsonResponse(LARGE), accept="identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_strong_etag_is_weakened(self):
+        original = JsonResponse(LARGE)
+        original["ETag"] = '"abc"'
+        self.assertEqual(self.get(original)["ETag"], 'W/"abc"')
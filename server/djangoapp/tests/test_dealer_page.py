@@ -0,0 +1,67 @@
+"""
+Tests for the combined get_dealer_page view in djangoapp.views.
+"""
+
+import json
+import threading
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .. import views
+
+DEALER = [{"id": 15, "full_name": "Best Cars"}]
+REVIEWS = [{"id": 1, "dealership": 15, "review": "Great"}]
+
+
+@override_settings(LOCAL_REPLICA_READS=False)
+class DealerPageTests(SimpleTestCase):
+    """
+    Tests how get_dealer_page fetches from the backend and reports failures.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.threads = {}
+        self.responses = {
+            "/fetchDealer/15": DEALER,
+            "/fetchReviews/dealer/15": REVIEWS,
+        }
+        patcher = mock.patch.object(views, "get_request", self.get_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_request(self, endpoint):
+        self.threads[endpoint] = threading.current_thread()
+        return self.responses[endpoint]
+
+    def get(self, **params):
+        request = self.factory.get("/", params)
+        return json.loads(views.get_dealer_page(request, 15).content)
+
+    def test_returns_dealer_and_reviews(self):
+        body = self.get(fields="dealer,reviews.review")
+        self.assertEqual(body["status"], 200)
+        self.assertEqual(body["dealer"], DEALER)
+        self.assertEqual(body["reviews"], [{"review": "Great"}])
+
+    def test_one_fetch_runs_on_the_request_thread(self):
+        self.get(fields="dealer,reviews.review")
+        threads = set(self.threads.values())
+        self.assertEqual(len(threads), 2)
+        self.assertIn(threading.current_thread(), threads)
+
+    def test_a_single_fetch_stays_on_the_request_thread(self):
+        self.get(fields="dealer")
+        self.assertEqual(
+            self.threads, {"/fetchDealer/15": threading.current_thread()}
+        )
+
+    def test_backend_failure_returns_503(self):
+        for endpoint in self.responses:
+            with self.subTest(down=endpoint):
+                responses = dict(self.responses, **{endpoint: None})
+                with mock.patch.dict(self.responses, responses):
+                    body = self.get(fields="dealer,reviews.review")
+                self.assertEqual(body["status"], 503)
+                self.assertNotIn("dealer", body)
@@ -0,0 +1,87 @@
+"""
+Tests for the conditional_json view decorator in djangoapp.decorators.
+"""
+
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..decorators import conditional_json
+from ..responses import JsonResponse
+
+
+@conditional_json("dealers")
+def dealers(request):
+    return JsonResponse({"status": 200, "dealers": [{"id": 1}]})
+
+
+@conditional_json("dealers")
+def failing(request):
+    return JsonResponse({"status": 500}, status=500)
+
+
+@conditional_json("dealers")
+def no_store(request):
+    response = JsonResponse({"status": 200, "dealers": None})
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@override_settings(API_CACHE_CONTROL={"dealers": {"max_age": 60}})
+class ConditionalJsonTests(SimpleTestCase):
+    """
+    Tests ETag generation and If-None-Match handling of conditional_json.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get(self, view, method="get", **headers):
+        return view(getattr(self.factory, method)("/", headers=headers))
+
+    def test_sets_a_strong_etag_and_the_cache_policy(self):
+        response = self.get(dealers)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response["ETag"].startswith("W/"))
+        self.assertEqual(response["Cache-Control"], "max-age=60")
+
+    def test_matching_etag_returns_304(self):
+        etag = self.get(dealers)["ETag"]
+        response = self.get(dealers, if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response["Cache-Control"], "max-age=60")
+
+    def test_weakened_etag_still_matches(self):
+        # CompressionMiddleware hands clients a W/ version of the ETag
+        weak = "W/" + self.get(dealers)["ETag"]
+        response = self.get(dealers, if_none_match=f'"other", {weak}')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], weak)
+
+    def test_wildcard_matches(self):
+        response = self.get(dealers, if_none_match="*")
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response["ETag"].startswith("W/"))
+
+    def test_stale_etag_returns_the_body(self):
+        response = self.get(dealers, if_none_match='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"dealers", response.content)
+
+    def test_other_responses_are_left_alone(self):
+        for view, method in (
+            (failing, "get"),
+            (no_store, "get"),
+            (dealers, "post"),
+        ):
+            with self.subTest(view=view.__name__, method=method):
+                response = self.get(view, method, if_none_match="*")
+                self.assertNotEqual(response.status_code, 304)
+                self.assertFalse(response.has_header("ETag"))
+
+    def test_streaming_responses_are_left_alone(self):
+        view = conditional_json("dealers")(
+            lambda request: StreamingHttpResponse([b"{}"])
+        )
+        self.assertFalse(self.get(view).has_header("ETag"))
@@ -0,0 +1,98 @@
+"""
+Tests for the columnar inventory index in djangoapp.inventory.
+"""
+
+from django.test import SimpleTestCase
+
+from ..inventory import InventoryIndex
+
+
+def car(dealer_id, make, model, body, year, mileage, price=None):
+    return {
+        "dealer_id": dealer_id,
+        "make": make,
+        "model": model,
+        "bodyType": body,
+        "year": year,
+        "mileage": mileage,
+        "price": price,
+    }
+
+
+RECORDS = [
+    car(2, "Audi", "A4", "Sedan", 2018, 40000, 21000),
+    car(1, "Audi", "Q5", "SUV", 2021, 12000, 38000),
+    car(2, "BMW", "X5", "SUV", 2020, 30000),
+    car(2, "audi", "a4", "sedan", 2022, 5000, 34000),
+    car(2, "Toyota", "Camry", "Sedan", 2015, 90000, 9000),
+    car(2, "BMW", "X3", "SUV", 2019, 45000, 27000),
+]
+
+
+def models(cars):
+    return [(car["model"], car["year"]) for car in cars]
+
+
+class InventoryIndexTests(SimpleTestCase):
+    """
+    Tests filtering, sorting and paging of a dealer's inventory.
+    """
+
+    def setUp(self):
+        self.index = InventoryIndex(RECORDS)
+
+    def query(self, **filters):
+        return self.index.query(2, **filters)
+
+    def test_only_the_dealers_cars_are_returned(self):
+        total, cars = self.index.query(1)
+        self.assertEqual((total, models(cars)), (1, [("Q5", 2021)]))
+        self.assertEqual(self.query()[0], 5)
+        self.assertEqual(self.index.query(99), (0, []))
+
+    def test_string_filters_are_case_insensitive(self):
+        self.assertEqual(self.query(make="AUDI")[0], 2)
+        self.assertEqual(self.query(model="A4")[0], 2)
+        self.assertEqual(self.query(body_type="suv")[0], 2)
+        self.assertEqual(self.query(make="Kia"), (0, []))
+
+    def test_range_filters_are_inclusive(self):
+        self.assertEqual(self.query(year_min=2019)[0], 3)
+        self.assertEqual(self.query(year_max=2018)[0], 2)
+        self.assertEqual(self.query(max_mileage=40000)[0], 3)
+        self.assertEqual(self.query(price_min=27000)[0], 2)
+        self.assertEqual(self.query(price_max=21000)[0], 2)
+
+    def test_filters_combine(self):
+        total, cars = self.query(make="BMW", body_type="SUV", year_min=2020)
+        self.assertEqual((total, models(cars)), (1, [("X5", 2020)]))
+
+    def test_missing_prices_never_match_a_price_filter(self):
+        _, cars = self.query(price_min=0)
+        self.assertNotIn("X5", [car["model"] for car in cars])
+        _, cars = self.query(make="BMW")
+        prices = {car["model"]: car["price"] for car in cars}
+        self.assertEqual(prices, {"X5": None, "X3": 27000.0})
+
+    def test_sort_ascending_and_descending(self):
+        years = [car["year"] for car in self.query(sort="year")[1]]
+        self.assertEqual(years, [2015, 2018, 2019, 2020, 2022])
+        years = [car["year"] for car in self.query(sort="-year")[1]]
+        self.assertEqual(years, [2022, 2020, 2019, 2018, 2015])
+        makes = [car["make"] for car in self.query(sort="-make")[1]]
+        self.assertEqual(makes[0], "Toyota")
+
+    def test_missing_prices_sort_last_either_way(self):
+        prices = [car["price"] for car in self.query(sort="price")[1]]
+        self.assertEqual(prices, [9000.0, 21000.0, 27000.0, 34000.0, None])
+        prices = [car["price"] for car in self.query(sort="-price")[1]]
+        self.assertEqual(prices, [34000.0, 27000.0, 21000.0, 9000.0, None])
+
+    def test_unsupported_sort_raises(self):
+        with self.assertRaises(ValueError):
+            self.query(sort="colour")
+
+    def test_offset_and_limit_page_the_matches(self):
+        total, cars = self.query(sort="year", offset=1, limit=2)
+        self.assertEqual(total, 5)
+        self.assertEqual([car["year"] for car in cars], [2018, 2019])
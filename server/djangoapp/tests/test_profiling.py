@@ -0,0 +1,69 @@
+"""
+Tests for ProfilingMiddleware in djangoapp.middleware.
+"""
+
+import glob
+import json
+import os
+import tempfile
+from unittest import mock
+
+import requests
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .. import restapis
+from ..middleware import ProfilingMiddleware
+from ..responses import JsonResponse
+
+
+def fetch_on_pool(request):
+    # One call on the request thread, one on the upstream pool
+    restapis.get_request_raw("/fetchDealers")
+    restapis.upstream_executor.submit(
+        restapis.get_request_raw, "/fetchReviews"
+    ).result()
+    return JsonResponse({"status": 200})
+
+
+class ProfilingMiddlewareTests(SimpleTestCase):
+    """
+    Tests that profiled requests record upstream call times from every
+    thread next to their profile.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        patcher = override_settings(
+            PROFILING_ENABLED=True,
+            PROFILING_SAMPLE_RATE=1.0,
+            PROFILING_DIR=self.directory,
+        )
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"[]"
+        patcher = mock.patch.object(
+            restapis.requests, "request", return_value=response
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_upstream_calls_on_any_thread_are_saved_with_the_profile(self):
+        middleware = ProfilingMiddleware(fetch_on_pool)
+        middleware(RequestFactory().get("/"))
+
+        [profile] = glob.glob(os.path.join(self.directory, "*.pstats"))
+        with open(profile + ".upstream.json", encoding="utf-8") as file:
+            saved = json.load(file)
+        self.assertEqual(
+            [call["upstream"] for call in saved["calls"]],
+            ["backend", "backend"],
+        )
+        self.assertGreater(saved["duration_ms"], 0)
+
+    def test_unprofiled_requests_record_nothing(self):
+        fetch_on_pool(RequestFactory().get("/"))
+        self.assertIsNone(restapis.upstream_timings.get())
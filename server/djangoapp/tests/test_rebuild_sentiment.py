@@ -0,0 +1,81 @@
+"""
+Tests for the rebuild_sentiment command and rebuild_sentiment_summaries.
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from ..models import DealerSentiment
+
+DEALERS = [{"id": 1, "state": "Texas"}, {"id": 2, "state": "Kansas"}]
+REVIEWS = [
+    {"dealership": 1, "review": "great"},
+    {"dealership": 2, "review": "awful"},
+]
+
+
+def score(texts):
+    return [
+        {"sentiment": "positive" if text == "great" else "negative"}
+        for text in texts
+    ]
+
+
+def score_all_but_last(texts):
+    results = score(texts)
+    results[-1] = None
+    return results
+
+
+class RebuildSentimentTests(TestCase):
+    """
+    Tests that a rebuild only replaces the counters when every review was
+    scored, unless partial results are allowed.
+    """
+
+    def setUp(self):
+        DealerSentiment.objects.create(dealer_id=1, state="Texas", neutral=5)
+        patcher = mock.patch(
+            "djangoapp.management.commands.rebuild_sentiment.get_request",
+            lambda endpoint: REVIEWS if "Reviews" in endpoint else DEALERS,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def rebuild(self, analyzer, *args):
+        with mock.patch(
+            "djangoapp.sentiment.analyze_many_review_sentiments", analyzer
+        ):
+            call_command(
+                "rebuild_sentiment",
+                *args,
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+    def test_replaces_counters_when_every_review_is_scored(self):
+        self.rebuild(score)
+        counts = dict(
+            DealerSentiment.objects.values_list("dealer_id", "positive")
+        )
+        self.assertEqual(counts, {1: 1, 2: 0})
+        self.assertEqual(DealerSentiment.objects.get(dealer_id=1).neutral, 0)
+
+    def test_skipped_reviews_fail_and_leave_counters_untouched(self):
+        with self.assertRaisesMessage(CommandError, "1 of 2 reviews"):
+            self.rebuild(score_all_but_last)
+        self.assertEqual(
+            list(DealerSentiment.objects.values_list("dealer_id", "neutral")),
+            [(1, 5)],
+        )
+
+    def test_allow_partial_writes_what_was_scored(self):
+        self.rebuild(score_all_but_last, "--allow-partial")
+        self.assertEqual(
+            list(DealerSentiment.objects.values_list("dealer_id", "positive")),
+            [(1, 1)],
+        )
@@ -0,0 +1,58 @@
+"""
+Tests for the review replica and its sync watermark in djangoapp.replica.
+"""
+
+from django.test import TestCase
+
+from ..models import Review
+from ..replica import review_watermark, store_review, sync_reviews
+
+
+def review(review_id, dealership=1, text="Fine"):
+    return {"id": review_id, "dealership": dealership, "review": text}
+
+
+class SyncReviewsTests(TestCase):
+    """
+    Tests that only syncs move the watermark, and never backwards.
+    """
+
+    def test_watermark_starts_at_zero(self):
+        self.assertEqual(review_watermark(), 0)
+
+    def test_sync_advances_the_watermark(self):
+        self.assertEqual(sync_reviews([review(3), review(5)]), 2)
+        self.assertEqual(review_watermark(), 5)
+        sync_reviews([review(8)])
+        self.assertEqual(review_watermark(), 8)
+
+    def test_empty_incremental_sync_keeps_the_watermark(self):
+        sync_reviews([review(5)])
+        sync_reviews([])
+        self.assertEqual(review_watermark(), 5)
+
+    def test_written_through_reviews_do_not_move_the_watermark(self):
+        sync_reviews([review(5)])
+        store_review(review(9))
+        self.assertEqual(review_watermark(), 5)
+        # A review posted elsewhere with a lower id is still pulled
+        sync_reviews([review(7)])
+        self.assertEqual(review_watermark(), 7)
+        self.assertEqual(
+            list(Review.objects.order_by("id").values_list("id", flat=True)),
+            [5, 7, 9],
+        )
+
+    def test_incremental_sync_updates_existing_rows(self):
+        sync_reviews([review(5, text="Fine")])
+        sync_reviews([review(5, text="Edited")])
+        self.assertEqual(Review.objects.get(id=5).review, "Edited")
+
+    def test_full_sync_replaces_rows_and_resets_the_watermark(self):
+        sync_reviews([review(5), review(9)])
+        sync_reviews([review(2), review(4)], full=True)
+        self.assertEqual(review_watermark(), 4)
+        self.assertEqual(
+            list(Review.objects.order_by("id").values_list("id", flat=True)),
+            [2, 4],
+        )
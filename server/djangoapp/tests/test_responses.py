@@ -0,0 +1,59 @@
+"""
+Tests for the JSON response helpers in djangoapp.responses.
+"""
+
+import json
+
+from django.test import SimpleTestCase, override_settings
+
+from ..responses import JSON_BACKENDS, JsonResponse, splice_json
+
+
+class SpliceJsonTests(SimpleTestCase):
+    """
+    Tests that splice_json embeds pre-encoded members verbatim.
+    """
+
+    def test_raw_members_follow_the_envelope(self):
+        body = splice_json({"status": 200}, dealers=b'[{"id":1}]')
+        self.assertEqual(
+            json.loads(body), {"status": 200, "dealers": [{"id": 1}]}
+        )
+
+    def test_raw_bytes_are_not_reencoded(self):
+        raw = b'{"price": 1.50, "name": "caf\\u00e9"}'
+        self.assertIn(raw, splice_json({"status": 200}, car=raw))
+
+    def test_none_becomes_null(self):
+        body = splice_json({"status": 200}, dealer=None)
+        self.assertEqual(json.loads(body), {"status": 200, "dealer": None})
+
+    def test_empty_envelope(self):
+        body = splice_json({}, a=b"1", b=bytearray(b"[2]"))
+        self.assertEqual(json.loads(body), {"a": 1, "b": [2]})
+
+    def test_without_raw_members_matches_a_plain_dump(self):
+        self.assertEqual(
+            json.loads(splice_json({"status": 200})), {"status": 200}
+        )
+
+    def test_keys_are_escaped(self):
+        body = splice_json({}, **{'odd"key': b"true"})
+        self.assertEqual(json.loads(body), {'odd"key': True})
+
+    def test_every_backend_splices_the_same_object(self):
+        for backend in JSON_BACKENDS:
+            with (
+                self.subTest(backend=backend),
+                override_settings(JSON_RESPONSE_BACKEND=backend),
+            ):
+                body = splice_json({"status": 200}, reviews=b"[]")
+                self.assertEqual(
+                    json.loads(body), {"status": 200, "reviews": []}
+                )
+
+    def test_response_passes_spliced_bytes_through(self):
+        body = splice_json({"status": 200}, dealers=b"[]")
+        response = JsonResponse(body)
+        self.assertEqual(response.content, body)
+        self.assertEqual(response["Content-Type"], "application/json")
@@ -0,0 +1,156 @@
+"""
+Tests for the in-process review index in djangoapp.search.
+"""
+
+from django.test import SimpleTestCase
+
+from ..search import ReviewIndex
+
+REVIEWS = [
+    {
+        "id": 1,
+        "dealership": 15,
+        "car_make": "Audi",
+        "car_model": "A4",
+        "car_year": 2020,
+        "review": "Great service, great price",
+    },
+    {
+        "id": 2,
+        "dealership": 15,
+        "car_make": "BMW",
+        "car_model": "X5",
+        "car_year": 2021,
+        "review": "The service was slow and the coffee was cold",
+    },
+    {
+        "id": 3,
+        "dealership": 7,
+        "car_make": "Audi",
+        "car_model": "Q5",
+        "car_year": 2021,
+        "review": "Fair price, friendly staff",
+    },
+    {
+        "id": 4,
+        "dealership": 7,
+        "car_make": "Toyota",
+        "car_model": "Camry",
+        "car_year": 2019,
+        "review": "Nothing to report",
+    },
+]
+
+DEALERS = [
+    {"id": 7, "state": "Texas"},
+    {"id": 15, "state": "Kansas"},
+    {"id": 21, "state": "Texas"},
+]
+
+
+def ids(results):
+    return [review["id"] for review in results]
+
+
+class ReviewIndexTests(SimpleTestCase):
+    """
+    Tests ranking, facet filtering, replacement and paging of ReviewIndex.
+    """
+
+    def setUp(self):
+        self.index = ReviewIndex()
+        self.index.set_dealers(DEALERS)
+        self.index.build(REVIEWS)
+
+    def test_build_tracks_size_and_synced_id(self):
+        self.assertTrue(self.index.built)
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.synced_id, 4)
+
+    def test_bm25_ranks_repeated_terms_in_short_reviews_first(self):
+        total, results = self.index.search("great service")
+        self.assertEqual(total, 2)
+        self.assertEqual(ids(results), [1, 2])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_rare_terms_outweigh_common_ones(self):
+        # "coffee" appears once, "price" twice: the coffee review wins
+        _, results = self.index.search("coffee price")
+        self.assertEqual(ids(results)[0], 2)
+
+    def test_no_query_lists_newest_first(self):
+        total, results = self.index.search()
+        self.assertEqual(total, 4)
+        self.assertEqual(ids(results), [4, 3, 2, 1])
+
+    def test_facets_are_anded_across_fields(self):
+        total, results = self.index.search(
+            filters={"car_make": "audi", "car_year": 2021}
+        )
+        self.assertEqual((total, ids(results)), (1, [3]))
+
+    def test_facet_values_are_ored_within_a_field(self):
+        total, results = self.index.search(
+            filters={"car_make": ["Toyota", "BMW"]}
+        )
+        self.assertEqual((total, ids(results)), (2, [4, 2]))
+
+    def test_facets_restrict_ranked_matches(self):
+        total, results = self.index.search("price", {"dealership": 7})
+        self.assertEqual((total, ids(results)), (1, [3]))
+
+    def test_unmatched_facet_value_returns_nothing(self):
+        self.assertEqual(
+            self.index.search("price", {"car_make": "Kia"}), (0, [])
+        )
+
+    def test_state_matches_its_dealerships(self):
+        total, results = self.index.search(filters={"state": "texas"})
+        self.assertEqual((total, ids(results)), (2, [4, 3]))
+        total, results = self.index.search(
+            "service", {"state": ["Kansas", "Ohio"]}
+        )
+        self.assertEqual((total, ids(results)), (2, [1, 2]))
+
+    def test_state_combines_with_dealership(self):
+        self.assertEqual(
+            self.index.search(filters={"state": "Texas", "dealership": 15}),
+            (0, []),
+        )
+
+    def test_reloading_dealers_moves_their_reviews(self):
+        self.index.set_dealers([{"id": 15, "state": "Texas"}])
+        self.assertEqual(self.index.search(filters={"state": "Kansas"})[0], 0)
+        self.assertEqual(self.index.search(filters={"state": "Texas"})[0], 2)
+
+    def test_unknown_facet_raises(self):
+        with self.assertRaises(ValueError):
+            self.index.search(filters={"colour": "red"})
+
+    def test_adding_the_same_id_replaces_the_review(self):
+        self.index.add(
+            {
+                "id": 1,
+                "dealership": 7,
+                "car_make": "Kia",
+                "review": "Terrible experience",
+            }
+        )
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.search("great")[0], 0)
+        self.assertEqual(self.index.search(filters={"car_make": "Audi"})[0], 1)
+        total, results = self.index.search("terrible", {"dealership": 7})
+        self.assertEqual((total, ids(results)), (1, [1]))
+
+    def test_refresh_advances_synced_id(self):
+        added = self.index.refresh([{"id": 9, "review": "Late addition"}])
+        self.assertEqual(added, 1)
+        self.assertEqual(self.index.synced_id, 9)
+        self.assertEqual(ids(self.index.search("late")[1]), [9])
+
+    def test_pages_split_the_ranking(self):
+        first = self.index.search(page=1, page_size=3)
+        second = self.index.search(page=2, page_size=3)
+        self.assertEqual((first[0], ids(first[1])), (4, [4, 3, 2]))
+        self.assertEqual((second[0], ids(second[1])), (4, [1]))
+        self.assertEqual(self.index.search(page=3, page_size=3), (4, []))
@@ -0,0 +1,145 @@
+"""
+Tests for SentimentBatcher in djangoapp.restapis.
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .. import restapis
+from ..restapis import SentimentBatcher
+
+
+def echo_batch(self, texts):
+    time.sleep(0.01)
+    return [{"sentiment": text} for text in texts]
+
+
+@mock.patch.object(SentimentBatcher, "_send_batch", echo_batch)
+class SentimentBatcherTests(SimpleTestCase):
+    """
+    Tests result ordering and failure handling of SentimentBatcher.
+    """
+
+    def test_results_keep_submission_order(self):
+        batcher = SentimentBatcher(window=0.01, max_size=4)
+        texts = [f"text {i}" for i in range(10)]
+        results = batcher.results([batcher.submit(text) for text in texts])
+        self.assertEqual([result["sentiment"] for result in results], texts)
+        self.assertGreater(batcher.snapshot()["batch_size"]["count"], 1)
+
+    def test_concurrent_callers_get_their_own_results(self):
+        batcher = SentimentBatcher(window=0.01, max_size=32)
+        results = {}
+
+        def call(i):
+            texts = [f"{i}-{j}" for j in range(3)]
+            futures = [batcher.submit(text) for text in texts]
+            results[i] = (texts, batcher.results(futures))
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for texts, answers in results.values():
+            self.assertEqual(
+                [answer["sentiment"] for answer in answers], texts
+            )
+
+    def test_dispatched_batch_times_out_to_none(self):
+        batcher = SentimentBatcher(window=0.001, max_size=4)
+        batcher.batch_timeout = 0.05
+        with mock.patch.object(
+            SentimentBatcher,
+            "_send_batch",
+            lambda self, texts: time.sleep(0.5) or [None] * len(texts),
+        ):
+            start = time.monotonic()
+            self.assertEqual(batcher.results([batcher.submit("slow")]), [None])
+            self.assertLess(time.monotonic() - start, 0.4)
+
+    def test_queued_texts_that_time_out_are_never_sent(self):
+        batcher = SentimentBatcher(
+            window=0.001, max_size=1, dispatch_workers=1
+        )
+        batcher.queue_timeout = 0.05
+        sent = []
+
+        def slow_batch(self, texts):
+            sent.extend(texts)
+            time.sleep(0.3)
+            return [{"sentiment": text} for text in texts]
+
+        with mock.patch.object(SentimentBatcher, "_send_batch", slow_batch):
+            blocker = batcher.submit("blocker")
+            time.sleep(0.02)
+            self.assertEqual(batcher.results([batcher.submit("late")]), [None])
+            self.assertEqual(
+                blocker.result(timeout=1), {"sentiment": "blocker"}
+            )
+            time.sleep(0.05)
+        self.assertEqual(sent, ["blocker"])
+
+    def test_batch_wait_starts_once_dispatched(self):
+        # Queueing and sending together exceed batch_timeout, but each
+        # phase is within its own limit.
+        batcher = SentimentBatcher(
+            window=0.001, max_size=1, dispatch_workers=1
+        )
+        batcher.queue_timeout = 1.0
+        batcher.batch_timeout = 0.25
+
+        def slow_batch(self, texts):
+            time.sleep(0.15)
+            return [{"sentiment": text} for text in texts]
+
+        with mock.patch.object(SentimentBatcher, "_send_batch", slow_batch):
+            futures = [batcher.submit(text) for text in ("a", "b", "c")]
+            self.assertEqual(
+                [result["sentiment"] for result in batcher.results(futures)],
+                ["a", "b", "c"],
+            )
+
+    def test_analyze_bulk_sends_chunks_in_order(self):
+        batcher = SentimentBatcher(window=0.001, max_size=4)
+        sizes = []
+
+        def record(self, texts):
+            sizes.append(len(texts))
+            return [{"sentiment": text} for text in texts]
+
+        texts = [str(i) for i in range(10)]
+        with mock.patch.object(SentimentBatcher, "_send_batch", record):
+            results = batcher.analyze_bulk(texts)
+        self.assertEqual([result["sentiment"] for result in results], texts)
+        self.assertEqual(sizes, [4, 4, 2])
+
+    def test_large_inputs_bypass_the_queue(self):
+        batcher = SentimentBatcher(window=0.001, max_size=4)
+        with (
+            mock.patch.object(restapis, "sentiment_batcher", batcher),
+            mock.patch.object(batcher, "submit") as submit,
+        ):
+            results = restapis.analyze_many_review_sentiments(
+                str(i) for i in range(9)
+            )
+        submit.assert_not_called()
+        self.assertEqual(len(results), 9)
+
+    def test_collector_survives_a_dispatch_error(self):
+        batcher = SentimentBatcher(window=0.001, max_size=4)
+        batcher.submit("warm up").result(timeout=1)
+        submit = batcher._executor.submit
+        with mock.patch.object(
+            batcher._executor,
+            "submit",
+            side_effect=[RuntimeError("shutting down"), submit],
+        ):
+            self.assertEqual(batcher.results([batcher.submit("lost")]), [None])
+        self.assertEqual(
+            batcher.results([batcher.submit("after")]),
+            [{"sentiment": "after"}],
+        )
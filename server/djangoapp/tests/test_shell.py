@@ -0,0 +1,65 @@
+"""
+Tests for the SPA shell views in djangoproj.views.
+"""
+
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from djangoproj.views import ShellView, clear_shell_cache
+
+
+class ShellViewTests(SimpleTestCase):
+    """
+    Tests caching and ETag revalidation of ShellView.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view = ShellView.as_view(template_name="index.html")
+        patcher = mock.patch(
+            "djangoproj.views.render_to_string",
+            return_value="<html>shell</html>",
+        )
+        self.render = patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_shell_cache()
+        self.addCleanup(clear_shell_cache)
+
+    def get(self, **headers):
+        return self.view(self.factory.get("/", headers=headers))
+
+    def test_serves_the_shell_with_an_etag(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<html>shell</html>")
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_matching_etag_returns_304(self):
+        etag = self.get()["ETag"]
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_wildcard_returns_304(self):
+        self.assertEqual(self.get(if_none_match="*").status_code, 304)
+
+    def test_stale_etag_returns_the_shell(self):
+        response = self.get(if_none_match='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<html>shell</html>")
+
+    def test_renders_once_per_template(self):
+        for _ in range(3):
+            self.get()
+        self.assertEqual(self.render.call_count, 1)
+
+    @override_settings(SPA_SHELL_CACHE=False)
+    def test_renders_every_time_with_the_cache_off(self):
+        self.get()
+        self.render.return_value = "<html>edited</html>"
+        response = self.get()
+        self.assertEqual(self.render.call_count, 2)
+        self.assertEqual(response.content, b"<html>edited</html>")
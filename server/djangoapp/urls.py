@@ -33,6 +33,42 @@ urlpatterns = [
         view=views.get_dealer_reviews,
         name="dealer_details",
     ),
+    # path for composite dealer page view
+    path(
+        route="dealer/<int:dealer_id>/page",
+        view=views.get_dealer_page,
+        name="dealer_page",
+    ),
+    # path for dealer sentiment summary view
+    path(
+        route="dealer/<int:dealer_id>/sentiment_summary",
+        view=views.get_dealer_sentiment_summary,
+        name="dealer_sentiment_summary",
+    ),
+    # path for sentiment leaderboard view
+    path(
+        route="sentiment/leaderboard",
+        view=views.get_sentiment_leaderboard,
+        name="sentiment_leaderboard",
+    ),
+    # path for dealer inventory view
+    path(
+        route="inventory/<int:dealer_id>",
+        view=views.get_dealer_inventory,
+        name="dealer_inventory",
+    ),
+    # path for review search view
+    path(
+        route="reviews/search",
+        view=views.search_reviews,
+        name="search_reviews",
+    ),
+    # path for upstream circuit breaker status view
+    path(
+        route="upstreams/status",
+        view=views.get_upstream_status,
+        name="upstream_status",
+    ),
     # path for add a review view
     path(route="add_review/", view=views.add_review, name="add_review"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
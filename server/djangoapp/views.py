@@ -13,12 +13,35 @@ import logging
 
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
-from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from .decorators import conditional_json
+from .inventory import get_inventory_index
 from .models import CarMake, CarModel
 from .populate import initiate
-from .restapis import analyze_review_sentiments, get_request, post_review
+from .replica import (
+    get_replica_dealer,
+    get_replica_dealers,
+    get_replica_reviews,
+    replica_enabled,
+    store_review,
+)
+from .responses import JsonResponse, splice_json
+from .restapis import (
+    analyze_many_review_sentiments,
+    get_request,
+    get_request_raw,
+    post_review,
+    sentiment_batching_status,
+    upstream_executor,
+    upstream_status,
+)
+from .search import FACET_FIELDS, get_review_index, index_review
+from .sentiment import (
+    get_leaderboard,
+    get_sentiment_summary,
+    record_review_sentiment,
+)
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
@@ -219,13 +242,15 @@ def get_cars(request):
     return JsonResponse({"CarModels": cars})
 
 
+@conditional_json("get_dealerships")
 def get_dealerships(request, state="All"):
     """
     Retrieves a list of dealerships, optionally filtered by state.
 
     This view fetches dealership data from the backend service. If a state is
     provided, it requests dealerships from that specific state; otherwise, it
-    requests all dealerships.
+    requests all dealerships. With LOCAL_REPLICA_READS enabled, the local
+    replica is read first and the backend is only asked if it has no match.
 
     Args:
         request (HttpRequest): The incoming HTTP request.
@@ -233,14 +258,25 @@ def get_dealerships(request, state="All"):
                                Defaults to "All".
 
     Returns:
-        JsonResponse: A JSON response containing the list of dealerships.
+        JsonResponse: A JSON response containing the list of dealerships,
+                      carrying an ETag and the configured Cache-Control.
     """
+    if replica_enabled():
+        dealerships = get_replica_dealers(state)
+        if dealerships:
+            return JsonResponse({"status": 200, "dealers": dealerships})
+
     if state == "All":
         endpoint = "/fetchDealers"
     else:
         endpoint = "/fetchDealers/" + state
-    dealerships = get_request(endpoint)
-    return JsonResponse({"status": 200, "dealers": dealerships})
+    # Relay the backend payload as-is instead of decoding and re-encoding it
+    dealerships = get_request_raw(endpoint)
+    response = JsonResponse(splice_json({"status": 200}, dealers=dealerships))
+    if dealerships is None:
+        # Never let browsers or a CDN hold on to a failed upstream fetch
+        response["Cache-Control"] = "no-store"
+    return response
 
 
 def get_dealer_reviews(request, dealer_id):
@@ -248,36 +284,53 @@ def get_dealer_reviews(request, dealer_id):
     Retrieves all reviews for a specific dealer and analyzes their sentiment.
 
     This view fetches reviews for the given 'dealer_id' from the backend
-    service. It then sends each review to a sentiment analysis microservice
-    and adds the sentiment to the review data.
+    service (or the local replica, with LOCAL_REPLICA_READS enabled). It then
+    sends each review to a sentiment analysis microservice and adds the
+    sentiment to the review data.
 
     Args:
         request (HttpRequest): The incoming HTTP request.
         dealer_id (int): The ID of the dealer whose reviews are to be fetched.
 
     Returns:
-        JsonResponse: A JSON response containing the reviews with sentiment,
-                      or a 'Bad Request' error if 'dealer_id' is not provided.
+        JsonResponse: A JSON response containing the reviews with sentiment
+                      (None where it could not be analyzed), a 'Bad Request'
+                      error if 'dealer_id' is not provided, or status 503 if
+                      the reviews are unavailable.
     """
     # if dealer id has been provided
     if dealer_id:
-        endpoint = "/fetchReviews/dealer/" + str(dealer_id)
-        reviews = get_request(endpoint)
-        for review_detail in reviews:
-            response = analyze_review_sentiments(review_detail["review"])
+        reviews = None
+        if replica_enabled():
+            reviews = get_replica_reviews(dealer_id) or None
+        if reviews is None:
+            endpoint = "/fetchReviews/dealer/" + str(dealer_id)
+            reviews = get_request(endpoint)
+        if reviews is None:
+            return JsonResponse(
+                {"status": 503, "message": "Service Unavailable"}
+            )
+        # Analyze all reviews together so they can share one analyzer batch
+        responses = analyze_many_review_sentiments(
+            review_detail["review"] for review_detail in reviews
+        )
+        for review_detail, response in zip(reviews, responses, strict=True):
             print(response)
-            review_detail["sentiment"] = response["sentiment"]
+            # Degrade to reviews without sentiment if the analyzer is down
+            review_detail["sentiment"] = response and response["sentiment"]
         return JsonResponse({"status": 200, "reviews": reviews})
     else:
         return JsonResponse({"status": 400, "message": "Bad Request"})
 
 
+@conditional_json("get_dealer_details")
 def get_dealer_details(request, dealer_id):
     """
     Retrieves the details of a specific dealer.
 
     This view fetches detailed information for the given 'dealer_id' from the
-    backend service.
+    backend service, or from the local replica with LOCAL_REPLICA_READS
+    enabled.
 
     Args:
         request (HttpRequest): The incoming HTTP request.
@@ -286,11 +339,23 @@ def get_dealer_details(request, dealer_id):
     Returns:
         JsonResponse: A JSON response containing the dealer's details, or a
                       'Bad Request' error if 'dealer_id' is not provided.
+                      Successful responses carry an ETag and the configured
+                      Cache-Control.
     """
     if dealer_id:
+        if replica_enabled():
+            dealership = get_replica_dealer(dealer_id)
+            if dealership:
+                return JsonResponse({"status": 200, "dealer": dealership})
+
         endpoint = "/fetchDealer/" + str(dealer_id)
-        dealership = get_request(endpoint)
-        return JsonResponse({"status": 200, "dealer": dealership})
+        dealership = get_request_raw(endpoint)
+        response = JsonResponse(
+            splice_json({"status": 200}, dealer=dealership)
+        )
+        if dealership is None:
+            response["Cache-Control"] = "no-store"
+        return response
     else:
         return JsonResponse({"status": 400, "message": "Bad Request"})
 
@@ -315,10 +380,326 @@ def add_review(request):
         data = json.loads(request.body)
         try:
             response = post_review(data)
-            return JsonResponse({"status": 200})
-        except Exception as e:
+        except Exception:
+            response = None
+        if response is None:
             return JsonResponse(
                 {"status": 401, "message": "Error in posting review"}
             )
+        # The backend has stored the review at this point, so a failing
+        # local hook must not make the client retry and post it twice.
+        hooks = [index_review, record_review_sentiment]
+        if replica_enabled():
+            hooks.append(store_review)
+        for hook in hooks:
+            try:
+                hook(response)
+            except Exception:
+                logger.exception("%s failed for posted review", hook.__name__)
+        return JsonResponse({"status": 200})
     else:
         return JsonResponse({"status": 403, "message": "Unauthorized"})
+
+
+def search_reviews(request):
+    """
+    Searches dealer reviews by text with optional facet filters.
+
+    Results come from the in-process review index and are ranked by
+    relevance to the query. Supported query parameters are 'q' (free text),
+    the facets 'dealership', 'car_make', 'car_model' and 'car_year' (each
+    may be repeated to match any of several values), 'state' (restricts the
+    search to dealerships in that state), 'page' and 'page_size'.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        JsonResponse: A JSON response containing the total number of matches
+                      and the requested page of reviews, a 'Bad Request'
+                      error for invalid parameters, or status 503 if the
+                      index could not be loaded.
+    """
+    try:
+        page = int(request.GET.get("page", 1))
+        page_size = int(request.GET.get("page_size", 20))
+    except ValueError:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+    if page < 1 or not 1 <= page_size <= 100:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+
+    filters = {}
+    for field in FACET_FIELDS:
+        values = request.GET.getlist(field)
+        if values:
+            filters[field] = values
+
+    state = request.GET.get("state")
+    if state:
+        filters["state"] = state
+
+    index = get_review_index()
+    if index is None:
+        return JsonResponse({"status": 503, "message": "Service Unavailable"})
+
+    query = request.GET.get("q", "")
+    total, reviews = index.search(query, filters, page, page_size)
+    return JsonResponse(
+        {
+            "status": 200,
+            "query": query,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "reviews": reviews,
+        }
+    )
+
+
+def get_dealer_sentiment_summary(request, dealer_id):
+    """
+    Retrieves the review sentiment counters for a specific dealer.
+
+    The counts come from the precomputed per-dealer summary rather than from
+    re-scoring the dealer's reviews.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+        dealer_id (int): The ID of the dealer.
+
+    Returns:
+        JsonResponse: A JSON response with the positive, neutral and negative
+                      counts and the average compound score.
+    """
+    return JsonResponse(
+        {"status": 200, "summary": get_sentiment_summary(dealer_id)}
+    )
+
+
+def get_sentiment_leaderboard(request):
+    """
+    Retrieves the dealers with the highest share of positive reviews.
+
+    Supported query parameters are 'state', 'limit' (1-100, default 10) and
+    'min_reviews' (default 1).
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        JsonResponse: A JSON response containing the ranked dealers, or a
+                      'Bad Request' error for invalid parameters.
+    """
+    try:
+        limit = int(request.GET.get("limit", 10))
+        min_reviews = int(request.GET.get("min_reviews", 1))
+    except ValueError:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+    if not 1 <= limit <= 100:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+
+    state = request.GET.get("state")
+    dealers = get_leaderboard(state, limit, min_reviews)
+    return JsonResponse({"status": 200, "state": state, "dealers": dealers})
+
+
+def get_dealer_inventory(request, dealer_id):
+    """
+    Retrieves a dealer's car inventory with optional filters.
+
+    The inventory is served from the in-memory columnar index over
+    'car_records.json'. Supported query parameters are 'make', 'model',
+    'body_type', 'year_min', 'year_max', 'max_mileage', 'price_min',
+    'price_max', 'sort' (year, mileage, price, make or model, prefixed with
+    '-' for descending), 'page' and 'page_size'.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+        dealer_id (int): The ID of the dealer whose inventory to list.
+
+    Returns:
+        JsonResponse: A JSON response containing the total number of matching
+                      cars and the requested page, or a 'Bad Request' error
+                      for invalid parameters.
+    """
+    params = request.GET
+    try:
+        numeric = {
+            name: cast(params[name])
+            for name, cast in (
+                ("year_min", int),
+                ("year_max", int),
+                ("max_mileage", int),
+                ("price_min", float),
+                ("price_max", float),
+            )
+            if params.get(name)
+        }
+        page = int(params.get("page", 1))
+        page_size = int(params.get("page_size", 50))
+    except ValueError:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+    if page < 1 or not 1 <= page_size <= 500:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+
+    try:
+        total, cars = get_inventory_index().query(
+            dealer_id,
+            make=params.get("make") or None,
+            model=params.get("model") or None,
+            body_type=params.get("body_type") or None,
+            sort=params.get("sort") or None,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+            **numeric,
+        )
+    except ValueError:
+        return JsonResponse({"status": 400, "message": "Bad Request"})
+    return JsonResponse(
+        {
+            "status": 200,
+            "dealer_id": dealer_id,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "cars": cars,
+        }
+    )
+
+
+def _parse_fields(value):
+    """
+    Parses a 'fields' query parameter into a selection mapping.
+
+    'fields' is a comma-separated list of section names ('dealer',
+    'reviews') or 'section.key' paths. A bare section selects the whole
+    section; paths restrict the section to the listed keys.
+
+    Returns:
+        dict or None: ``{section: set of keys or None}``, or None when no
+                      selection was requested.
+    """
+    if not value:
+        return None
+    selection = {}
+    for item in value.split(","):
+        section, _, key = item.strip().partition(".")
+        if not section:
+            continue
+        if key:
+            keys = selection.setdefault(section, set())
+            if keys is not None:
+                keys.add(key)
+        else:
+            selection[section] = None
+    return selection
+
+
+def _select_keys(items, keys):
+    """
+    Trims each dict in ``items`` to ``keys`` (all keys if None).
+    """
+    if keys is None or items is None:
+        return items
+    return [{k: v for k, v in item.items() if k in keys} for item in items]
+
+
+def get_dealer_page(request, dealer_id):
+    """
+    Retrieves everything the dealer page needs in a single response.
+
+    Dealer details and the dealer's reviews come from the local replica with
+    LOCAL_REPLICA_READS enabled; whatever it lacks is fetched from the
+    backend, one fetch on the request thread and the other concurrently on
+    the upstream pool. Review sentiment is then analyzed concurrently,
+    instead of the browser issuing one request per resource. The optional
+    'fields' query parameter trims the payload, e.g.
+    'fields=dealer.full_name,reviews.name,reviews.review,reviews.sentiment';
+    sentiment is only computed when it is selected.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+        dealer_id (int): The ID of the dealer.
+
+    Returns:
+        JsonResponse: A JSON response with 'dealer' and 'reviews' in the same
+                      shapes as the dealer details and dealer reviews views,
+                      or status 503 if the backend could not provide them.
+    """
+    selection = _parse_fields(request.GET.get("fields"))
+
+    def wanted(section, key=None):
+        if selection is None:
+            return True
+        if section not in selection:
+            return False
+        keys = selection[section]
+        return key is None or keys is None or key in keys
+
+    # Serve what the local replica has and fetch the rest from the backend
+    data = {}
+    if replica_enabled():
+        if wanted("dealer"):
+            data["dealer"] = get_replica_dealer(dealer_id) or None
+        if wanted("reviews"):
+            data["reviews"] = get_replica_reviews(dealer_id) or None
+
+    endpoints = {}
+    if wanted("dealer") and data.get("dealer") is None:
+        endpoints["dealer"] = "/fetchDealer/" + str(dealer_id)
+    if wanted("reviews") and data.get("reviews") is None:
+        endpoints["reviews"] = "/fetchReviews/dealer/" + str(dealer_id)
+
+    # Fetch one on this thread and only hand the other to the shared pool,
+    # so a page costs at most one pool thread
+    sections = list(endpoints)
+    futures = {
+        section: upstream_executor.submit(get_request, endpoints[section])
+        for section in sections[1:]
+    }
+    if sections:
+        data[sections[0]] = get_request(endpoints[sections[0]])
+    for section, future in futures.items():
+        data[section] = future.result()
+    if any(data[section] is None for section in sections):
+        return JsonResponse({"status": 503, "message": "Service Unavailable"})
+
+    payload = {"status": 200}
+    if wanted("dealer"):
+        payload["dealer"] = _select_keys(
+            data["dealer"], selection and selection["dealer"]
+        )
+    if wanted("reviews"):
+        reviews = data["reviews"]
+        if reviews and wanted("reviews", "sentiment"):
+            results = analyze_many_review_sentiments(
+                review["review"] for review in reviews
+            )
+            for review, result in zip(reviews, results, strict=True):
+                review["sentiment"] = result and result["sentiment"]
+        payload["reviews"] = _select_keys(
+            reviews, selection and selection["reviews"]
+        )
+    return JsonResponse(payload)
+
+
+def get_upstream_status(request):
+    """
+    Reports the circuit breaker state of each upstream service.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        JsonResponse: A JSON response listing each upstream with its circuit
+                      state, recent failure rate and rejected call count,
+                      plus the sentiment batch-size and queueing-delay
+                      histograms (None when batching is disabled).
+    """
+    return JsonResponse(
+        {
+            "status": 200,
+            "upstreams": upstream_status(),
+            "sentiment_batching": sentiment_batching_status(),
+        }
+    )
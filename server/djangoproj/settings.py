@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,10 +49,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "djangoapp.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "djangoapp.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "djangoapp.middleware.AdmissionControlMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -80,6 +84,102 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "djangoproj.wsgi.application"
 
+# Keep rendered SPA shell templates (Home.html, index.html, ...) in memory
+# instead of rendering them on every request. See djangoproj/views.py. Set
+# SPA_SHELL_CACHE=0 to pick up template edits without restarting.
+SPA_SHELL_CACHE = os.getenv("SPA_SHELL_CACHE", "1") == "1"
+
+# Encoder used by djangoapp.responses.JsonResponse: "auto" picks orjson when
+# it is installed (it is pinned in requirements.txt) and falls back to the
+# stdlib json module otherwise.
+JSON_RESPONSE_BACKEND = os.getenv("JSON_RESPONSE_BACKEND", "auto")
+
+# Response compression (djangoapp.middleware.CompressionMiddleware). Brotli
+# is used when the "brotli" package is installed and the client accepts it.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_CONTENT_TYPES = ["application/json"]
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "4"))
+
+# Car inventory served by /djangoapp/inventory/<dealer_id>, loaded once per
+# worker into djangoapp.inventory.InventoryIndex.
+INVENTORY_DATA_PATH = os.getenv(
+    "INVENTORY_DATA_PATH",
+    os.path.join(BASE_DIR, "database/data/car_records.json"),
+)
+
+# Seconds between pulls of newly posted reviews into each worker's search
+# index (djangoapp.search); reviews posted through the same worker show up
+# immediately.
+REVIEW_INDEX_REFRESH_SECONDS = int(
+    os.getenv("REVIEW_INDEX_REFRESH_SECONDS", "30")
+)
+
+# Cache-Control directives per view for djangoapp.decorators.conditional_json.
+# Keys are passed to django.utils.cache.patch_cache_control.
+API_CACHE_CONTROL = {
+    "get_dealerships": {
+        "public": True,
+        "max_age": int(os.getenv("DEALERS_MAX_AGE", "60")),
+        "stale_while_revalidate": 300,
+    },
+    "get_dealer_details": {
+        "public": True,
+        "max_age": int(os.getenv("DEALER_DETAILS_MAX_AGE", "60")),
+        "stale_while_revalidate": 300,
+    },
+}
+
+
+# Admission control (djangoapp.middleware.AdmissionControlMiddleware).
+# Per-client token buckets keyed by view function name: "rate" is tokens per
+# second and "burst" the bucket size.
+RATE_LIMITS = {
+    "get_dealer_reviews": {"rate": 1.0, "burst": 10},
+    "get_dealer_page": {"rate": 1.0, "burst": 10},
+    "add_review": {"rate": 0.1, "burst": 3},
+}
+# Views sharing the cap on in-flight upstream-heavy requests
+UPSTREAM_HEAVY_VIEWS = ["get_dealer_reviews", "get_dealer_page", "add_review"]
+UPSTREAM_CONCURRENCY_LIMIT = int(os.getenv("UPSTREAM_CONCURRENCY_LIMIT", "16"))
+# Dotted path of the rate-limit store; see djangoapp/ratelimit.py. With the
+# LocalMemoryStore the concurrency cap is shared by every worker on the host
+# through lock files in RATE_LIMIT_SLOT_DIR, but token buckets are per
+# worker. The CacheStore shares both through the RATE_LIMIT_CACHE cache;
+# point that at Redis or Memcached to enforce them across pods.
+RATE_LIMIT_STORE = os.getenv(
+    "RATE_LIMIT_STORE", "djangoapp.ratelimit.LocalMemoryStore"
+)
+RATE_LIMIT_CACHE = "default"
+RATE_LIMIT_SLOT_DIR = os.getenv(
+    "RATE_LIMIT_SLOT_DIR",
+    os.path.join(tempfile.gettempdir(), "djangoapp-slots"),
+)
+# How anonymous clients are identified. Behind the bundled nginx every
+# request arrives from the proxy, so REMOTE_ADDR alone would put all visitors
+# in one bucket. RATE_LIMIT_TRUSTED_PROXIES is the number of proxies in front
+# of Django that append to X-Forwarded-For; the client is the entry that many
+# places from the right, since anything further left came from the client and
+# can be forged. Set it to 0 when Django is exposed directly. Alternatively,
+# RATE_LIMIT_CLIENT_IP_HEADER names a header the proxy overwrites with the
+# client address (e.g. X-Real-IP) and takes precedence when present.
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+RATE_LIMIT_CLIENT_IP_HEADER = os.getenv("RATE_LIMIT_CLIENT_IP_HEADER", "")
+
+# On-demand request profiling (djangoapp.middleware.ProfilingMiddleware).
+# Nothing is installed unless DJANGO_PROFILING=1. Requests are then profiled
+# when they carry a signed X-Profile header (manage.py profile_report
+# --token prints one) or are sampled at PROFILING_SAMPLE_RATE.
+PROFILING_ENABLED = os.getenv("DJANGO_PROFILING") == "1"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_HEADER = "X-Profile"
+PROFILING_TOKEN_MAX_AGE = 3600
+PROFILING_DIR = os.getenv("PROFILING_DIR", os.path.join(BASE_DIR, "profiles"))
+
+# Serve dealer and review reads from the local replica (djangoapp.replica),
+# falling back to the backend when it has no match. Populate it with
+# "manage.py sync_backend".
+LOCAL_REPLICA_READS = os.getenv("LOCAL_REPLICA_READS") == "1"
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
@@ -18,24 +18,25 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
-from django.views.generic import TemplateView
+
+from .views import ShellView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("djangoapp/", include("djangoapp.urls")),
-    path("", TemplateView.as_view(template_name="Home.html")),
-    path("about/", TemplateView.as_view(template_name="About.html")),
-    path("contact/", TemplateView.as_view(template_name="Contact.html")),
-    path("login/", TemplateView.as_view(template_name="index.html")),
-    path("register/", TemplateView.as_view(template_name="index.html")),
-    path("logout/", TemplateView.as_view(template_name="index.html")),
-    path("dealers/", TemplateView.as_view(template_name="index.html")),
+    path("", ShellView.as_view(template_name="Home.html")),
+    path("about/", ShellView.as_view(template_name="About.html")),
+    path("contact/", ShellView.as_view(template_name="Contact.html")),
+    path("login/", ShellView.as_view(template_name="index.html")),
+    path("register/", ShellView.as_view(template_name="index.html")),
+    path("logout/", ShellView.as_view(template_name="index.html")),
+    path("dealers/", ShellView.as_view(template_name="index.html")),
     path(
         "dealer/<int:dealer_id>",
-        TemplateView.as_view(template_name="index.html"),
+        ShellView.as_view(template_name="index.html"),
     ),
     path(
         "postreview/<int:dealer_id>",
-        TemplateView.as_view(template_name="index.html"),
+        ShellView.as_view(template_name="index.html"),
     ),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
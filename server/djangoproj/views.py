@@ -0,0 +1,94 @@
+"""
+Project-level views for serving the single-page application shell.
+
+The client routes (``/``, ``/login/``, ``/dealers/``, ``/dealer/<id>`` and so
+on) all return a static HTML template that never depends on the request.
+Rendering it through the template engine and the full context processor
+stack on every hit is wasted work, so the views in this module render each
+template once, keep the bytes in memory together with a strong ETag, and
+answer conditional GETs with ``304 Not Modified``.
+"""
+
+import hashlib
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.template.loader import render_to_string
+from django.utils.http import parse_etags, quote_etag
+from django.views import View
+
+# Rendered shells keyed by template name: {template_name: (body, etag)}
+_shell_cache = {}
+_shell_lock = threading.Lock()
+
+
+def render_shell(template_name):
+    """
+    Renders a shell template and returns its bytes with a strong ETag.
+
+    The result is memoised per process when ``SPA_SHELL_CACHE`` is enabled
+    (the default), so each template is rendered at most once per worker.
+
+    Args:
+        template_name (str): The name of the template to render.
+
+    Returns:
+        tuple: A ``(body, etag)`` pair where ``body`` is the rendered
+               template as UTF-8 bytes and ``etag`` is the quoted ETag.
+    """
+    use_cache = getattr(settings, "SPA_SHELL_CACHE", True)
+    if use_cache:
+        cached = _shell_cache.get(template_name)
+        if cached is not None:
+            return cached
+
+    # The shells have no per-request context, so render without a request
+    # to skip the context processors entirely.
+    body = render_to_string(template_name).encode("utf-8")
+    etag = quote_etag(hashlib.sha256(body).hexdigest())
+
+    if use_cache:
+        with _shell_lock:
+            _shell_cache.setdefault(template_name, (body, etag))
+    return body, etag
+
+
+def clear_shell_cache():
+    """
+    Drops every rendered shell so the next request renders it again.
+    """
+    with _shell_lock:
+        _shell_cache.clear()
+
+
+class ShellView(View):
+    """
+    Serves a pre-rendered SPA shell template with ETag revalidation.
+
+    This is a drop-in replacement for ``TemplateView`` on routes whose
+    template takes no context.
+    """
+
+    template_name = None
+    content_type = "text/html; charset=utf-8"
+
+    def get(self, request, *args, **kwargs):
+        """
+        Returns the cached shell, or ``304`` if the client's copy is current.
+        """
+        body, etag = render_shell(self.template_name)
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            client_etags = parse_etags(if_none_match)
+            if "*" in client_etags or etag in client_etags:
+                response = HttpResponseNotModified()
+                response["ETag"] = etag
+                response["Cache-Control"] = "no-cache"
+                return response
+
+        response = HttpResponse(body, content_type=self.content_type)
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
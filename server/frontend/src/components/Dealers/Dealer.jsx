@@ -32,52 +32,32 @@ const Dealer = () => {
 
   useEffect(() => {
     const fetchData = async () => {
-      const dealer_url = `/djangoapp/dealer/${id}`;
-      const reviews_url = `/djangoapp/reviews/dealer/${id}`;
+      // Dealer details and reviews (with sentiment) arrive in one payload
+      const page_url = `/djangoapp/dealer/${id}/page`;
       const post_review = `/postreview/${id}`;
-      // Fetch dealer
       try {
-        const res = await fetch(dealer_url, {
+        const res = await fetch(page_url, {
           method: "GET",
           headers: { Accept: "application/json" },
         });
         if (res.ok) {
           const retobj = await res.json();
-          if (retobj.status === 200 && retobj.dealer) {
+          if (retobj.status === 200) {
             const dealerobjs = Array.from(retobj.dealer || []);
             setDealer(dealerobjs[0] || {});
+            if (Array.isArray(retobj.reviews) && retobj.reviews.length > 0) {
+              setReviews(retobj.reviews);
+            } else {
+              setUnreviewed(true);
+            }
           } else {
-            console.error("Unexpected dealer response:", retobj);
+            console.error("Unexpected dealer page response:", retobj);
           }
         } else {
-          console.error("Failed to fetch dealer, status:", res.status);
+          console.error("Failed to fetch dealer page, status:", res.status);
         }
       } catch (err) {
-        console.error("Error fetching dealer:", err);
-      }
-
-      // Fetch reviews
-      try {
-        const res = await fetch(reviews_url, {
-          method: "GET",
-          headers: { Accept: "application/json" },
-        });
-        if (res.ok) {
-          const retobj = await res.json();
-          if (
-            retobj.status === 200 &&
-            Array.isArray(retobj.reviews) &&
-            retobj.reviews.length > 0
-          ) {
-            setReviews(retobj.reviews);
-          } else {
-            setUnreviewed(true);
-          }
-        } else {
-          console.error("Failed to fetch reviews, status:", res.status);
-        }
-      } catch (err) {
-        console.error("Error fetching reviews:", err);
+        console.error("Error fetching dealer page:", err);
       }
 
       // (senti_icon is defined at component scope)
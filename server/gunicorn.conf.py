@@ -0,0 +1,183 @@
+"""
+Gunicorn configuration for the djangoproj WSGI application.
+
+Every setting can be overridden from the environment (e.g. in deployment.yaml)
+without rebuilding the image. The application is preloaded in the master so
+workers fork with Django already imported, which keeps worker start-up and
+autoscaling fast. The master also imports the views and builds the inventory
+and review indexes before forking, so every worker, including those
+replacing recycled ones, starts with them loaded instead of rebuilding them
+on its first request.
+
+Boot timing is logged at start-up: how long the master took to become ready
+(mostly importing the application) and, per worker, the time from fork to
+being ready and from exec to the first request served. Set
+GUNICORN_BOOT_REPORT to a file path to also append these numbers there as
+JSON lines, to track cold-start regressions.
+"""
+
+import json
+import math
+import os
+import time
+
+# Taken when gunicorn loads this file, right after the process starts
+_EXEC_TIME = time.time()
+
+
+def _available_cpus():
+    """
+    Returns the CPUs this process may use, honouring the container's quota.
+
+    The host's CPU count overstates it in a container: the affinity mask
+    narrows it to the CPUs we may be scheduled on, and a cgroup CPU quota
+    (v2 ``cpu.max`` or v1 ``cpu.cfs_quota_us``) caps it further.
+    """
+    cpus = len(os.sched_getaffinity(0))
+    for quota_file, period_file in (
+        ("/sys/fs/cgroup/cpu.max", None),
+        (
+            "/sys/fs/cgroup/cpu/cpu.cfs_quota_us",
+            "/sys/fs/cgroup/cpu/cpu.cfs_period_us",
+        ),
+    ):
+        try:
+            with open(quota_file, encoding="utf-8") as file:
+                values = file.read().split()
+            if period_file is not None:
+                with open(period_file, encoding="utf-8") as file:
+                    values.append(file.read().strip())
+        except OSError:
+            continue
+        quota, period = values[0], values[1]
+        if quota not in ("max", "-1"):
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+        break
+    return cpus
+
+
+bind = os.getenv("GUNICORN_BIND", ":8000")
+
+# Load Django once in the master and fork workers from it
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+
+# The usual (2 x CPUs) + 1 unless set explicitly, capped because every worker
+# loads its own copy of the inventory and review indexes
+_default_workers = min(
+    _available_cpus() * 2 + 1, int(os.getenv("GUNICORN_MAX_WORKERS", "8"))
+)
+workers = int(os.getenv("GUNICORN_WORKERS", str(_default_workers)))
+
+# Threaded workers suit the upstream-bound views better than more processes
+# do, and let concurrent requests in a worker share sentiment batches.
+# GUNICORN_THREADS=1 falls back to sync workers.
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = os.getenv(
+    "GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync"
+)
+
+# A sync worker handles one request at a time, so there is nothing to batch
+# with and batching would only add its window to every call
+if worker_class == "sync":
+    os.environ.setdefault("SENTIMENT_BATCHING", "0")
+
+# Recycle workers periodically to bound memory growth; the jitter keeps them
+# from all restarting at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+_boot_report_path = os.getenv("GUNICORN_BOOT_REPORT")
+
+
+def _report(log, event, **values):
+    values = {key: round(value, 4) for key, value in values.items()}
+    log.info(
+        "boot %s %s",
+        event,
+        " ".join(f"{key}={value}" for key, value in values.items()),
+    )
+    if _boot_report_path:
+        record = {"event": event, "pid": os.getpid(), "time": time.time()}
+        record.update(values)
+        with open(_boot_report_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+
+def _warm(log):
+    """
+    Imports the views and loads the inventory and review indexes.
+
+    A failure is logged rather than raised; the index is then loaded on
+    first use instead.
+    """
+    import djangoapp.views  # noqa: F401
+    from django.db import connections
+    from djangoapp.inventory import get_inventory_index
+    from djangoapp.search import get_review_index
+
+    started = time.time()
+    for load in (get_inventory_index, get_review_index):
+        try:
+            load()
+        except Exception:
+            log.exception("Could not warm %s", load.__name__)
+    # Workers must not share the master's database connections
+    connections.close_all()
+    _report(log, "warm", seconds=time.time() - started)
+
+
+def when_ready(server):
+    """
+    Warms the preloaded application, so workers fork with it ready, and
+    reports the time from exec until the master is ready to accept requests.
+    """
+    if preload_app:
+        _warm(server.log)
+    _report(server.log, "master_ready", seconds=time.time() - _EXEC_TIME)
+
+
+def post_fork(server, worker):
+    """
+    Records when each worker was forked.
+    """
+    worker.boot_forked_at = time.time()
+    worker.boot_first_request_served = False
+
+
+def post_worker_init(worker):
+    """
+    Reports how long a worker took from fork to being ready for requests.
+
+    Without preloading, each worker warms its own copy of the application.
+    """
+    if not preload_app:
+        _warm(worker.log)
+    _report(
+        worker.log,
+        "worker_ready",
+        since_fork=time.time() - worker.boot_forked_at,
+    )
+
+
+def post_request(worker, req, environ, resp):
+    """
+    Reports the time from exec (and from fork) to the first request served.
+    """
+    if worker.boot_first_request_served:
+        return
+    worker.boot_first_request_served = True
+    now = time.time()
+    _report(
+        worker.log,
+        "first_request",
+        since_exec=now - _EXEC_TIME,
+        since_fork=now - worker.boot_forked_at,
+    )